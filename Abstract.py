@@ -1,36 +1,251 @@
 #An abstract class in Python is a class that cannot be instantiated on its own and
-#  typically contains one or more abstract methods. 
+#  typically contains one or more abstract methods.
 # Abstract methods are defined in the abstract class and must be implemented by any subclass.
 
 from abc import ABC, abstractmethod
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; collections then compute areas in a Python loop
+    np = None
+
+PI = 3.14159
 
 class Shape(ABC):
+    # __slots__ instead of a per-object __dict__ keeps every shape small
+    __slots__ = ("color",)
+    # Subclasses that set parameters (the numeric constructor arguments after
+    # color, in order) and a formula can be stored column-wise in a
+    # ShapeCollection and have their areas computed for a whole column at once.
+    # formula computes the area from the parameters with plain arithmetic, so
+    # it works on single numbers (area) and on whole numpy columns (area_many).
+    # Only a class that defines parameters, formula and area itself is stored
+    # in columns: a subclass that inherits them (and may add state or change
+    # area) is kept as objects.
+    parameters = ()
+    formula = None
+
     def __init__(self, color):
         """
-        Abstract classes allow you to define some common behavior while still requiring subclasses 
-        to provide specific implementations. 
+        Abstract classes allow you to define some common behavior while still requiring subclasses
+        to provide specific implementations.
         They offer more flexibility than interfaces because they can contain
           both abstract and concrete methods.
         """
         self.color = color
-    
+
     @abstractmethod
     def area(self):
         pass
 
     def describe(self):
         return f"A {self.color} shape"
-    
+
+    @classmethod
+    def area_many(cls, *columns):
+        """
+        Returns the areas of many shapes of this class, given one column per
+        parameter: a numpy array, or an array('d') without numpy.
+        """
+        if not _columnar(cls):
+            raise TypeError(f"{cls.__name__} does not define its own formula")
+        if np is None:
+            return array("d", map(cls.formula, *columns))
+        return cls.formula(*(np.asarray(column, dtype=np.float64) for column in columns))
+
 # Concrete Class Implementing the Abstract Class
 class Circle(Shape):
+    __slots__ = ("radius",)
+    parameters = ("radius",)
+
     def __init__(self, color, radius):
         super().__init__(color)
         self.radius = radius
 
+    @staticmethod
+    def formula(radius):
+        # radius * radius rather than radius ** 2: Python's ** goes through the C
+        # pow function, numpy squares, and the two can differ in the last bit
+        return PI * (radius * radius)
+
     def area(self):
-        return 3.14159 * (self.radius ** 2)
-    
+        return self.formula(self.radius)
+
+class Square(Shape):
+    __slots__ = ("side",)
+    parameters = ("side",)
+
+    def __init__(self, color, side):
+        super().__init__(color)
+        self.side = side
+
+    @staticmethod
+    def formula(side):
+        return side * side
+
+    def area(self):
+        return self.formula(self.side)
+
+class Rectangle(Shape):
+    __slots__ = ("width", "height")
+    parameters = ("width", "height")
+
+    def __init__(self, color, width, height):
+        super().__init__(color)
+        self.width = width
+        self.height = height
+
+    @staticmethod
+    def formula(width, height):
+        return width * height
+
+    def area(self):
+        return self.formula(self.width, self.height)
+
+# Compact storage for many shapes
+class ShapeCollection:
+    """
+    Stores shapes column-wise instead of as one object each: for every shape
+    class, one array('d') per parameter and an array of color codes. area()
+    then runs each class's formula once over its whole columns.
+    Shape classes without parameters (any other Shape subclass) are kept as
+    objects and their area() is called one by one, so every Shape works.
+    Iterating over the collection gives Shape objects again, in the order the
+    shapes were added.
+    """
+    def __init__(self, shapes=()):
+        self._groups = {}  # Shape class -> _ShapeGroup
+        self._colors = []  # Color code -> color
+        self._color_codes = {}
+        self._size = 0
+        self.extend(shapes)
+
+    def __len__(self):
+        return self._size
+
+    def _group(self, shape_class):
+        group = self._groups.get(shape_class)
+        if group is None:
+            group = self._groups[shape_class] = _ShapeGroup(shape_class)
+        return group
+
+    def _color_code(self, color):
+        code = self._color_codes.get(color)
+        if code is None:
+            code = self._color_codes[color] = len(self._colors)
+            self._colors.append(color)
+        return code
+
+    def add(self, shape):
+        group = self._group(type(shape))
+        group.positions.append(self._size)
+        if group.columns is None:
+            group.objects.append(shape)
+        else:
+            group.colors.append(self._color_code(shape.color))
+            for name, column in zip(group.shape_class.parameters, group.columns):
+                column.append(getattr(shape, name))
+        self._size += 1
+
+    def extend(self, shapes):
+        for shape in shapes:
+            self.add(shape)
+
+    def add_many(self, shape_class, color, *columns):
+        """
+        Adds many shapes of one class and color without creating objects:
+        one column of values per parameter of shape_class, e.g.
+        add_many(Circle, "red", radii).
+        """
+        if not shape_class.parameters:
+            raise TypeError(f"{shape_class.__name__} has no parameters to store as columns")
+        if len(columns) != len(shape_class.parameters):
+            raise TypeError(f"{shape_class.__name__} takes the columns {shape_class.parameters}")
+        group = self._group(shape_class)
+        if group.columns is None:
+            raise TypeError(f"{shape_class.__name__} does not define its own formula")
+        columns = [_double_column(column) for column in columns]
+        count = len(columns[0])
+        if any(len(column) != count for column in columns):
+            raise ValueError("columns must have the same length")
+        for stored, column in zip(group.columns, columns):
+            stored.extend(column)
+        group.colors.extend(array("l", [self._color_code(color)]) * count)
+        group.positions.extend(range(self._size, self._size + count))
+        self._size += count
+
+    def area(self):
+        """
+        Returns the area of every shape, in the order they were added:
+        a numpy array, or an array('d') without numpy.
+        """
+        if np is None:
+            areas = array("d", bytes(8 * self._size))
+            for group in self._groups.values():
+                for position, area in zip(group.positions, group.areas()):
+                    areas[position] = area
+            return areas
+        areas = np.empty(self._size)
+        for group in self._groups.values():
+            areas[np.frombuffer(group.positions, dtype=np.int64)] = group.areas()
+        return areas
+
+    def total_area(self):
+        areas = self.area()
+        return float(areas.sum()) if np is not None else sum(areas)
+
+    def __iter__(self):
+        # Rebuild the shapes in the order they were added
+        shapes = [None] * self._size
+        for group in self._groups.values():
+            for position, shape in zip(group.positions, group.shapes(self._colors)):
+                shapes[position] = shape
+        return iter(shapes)
+
+def _double_column(values):
+    # Any sequence of numbers as an array('d'); numpy arrays are copied in one go
+    if isinstance(values, array) and values.typecode == "d":
+        return values
+    if np is not None and isinstance(values, np.ndarray):
+        return array("d", np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return array("d", values)
+
+def _columnar(shape_class):
+    # Whether shapes of this class can be stored as columns: it must define
+    # parameters, formula and area itself, so they are known to agree
+    attributes = vars(shape_class)
+    return (bool(shape_class.parameters) and shape_class.formula is not None
+            and "parameters" in attributes and "formula" in attributes and "area" in attributes)
+
+class _ShapeGroup:
+    # The shapes of one class inside a ShapeCollection
+    __slots__ = ("shape_class", "positions", "colors", "columns", "objects")
+
+    def __init__(self, shape_class):
+        self.shape_class = shape_class
+        self.positions = array("q")  # Where each shape sits in the collection
+        self.colors = array("l")
+        self.columns = [array("d") for _ in shape_class.parameters] if _columnar(shape_class) else None
+        self.objects = []  # The shapes themselves, when the class is not stored in columns
+
+    def areas(self):
+        if self.columns is None:
+            return [shape.area() for shape in self.objects]
+        return self.shape_class.area_many(*self.columns)
+
+    def shapes(self, colors):
+        if self.columns is None:
+            return self.objects
+        return (self.shape_class(colors[code], *values) for code, *values in zip(self.colors, *self.columns))
+
 if __name__ == "__main__":
     circle = Circle("red", 2)
     print(circle.describe())
-    print(circle.area())
\ No newline at end of file
+    print(circle.area())
+
+    # Many shapes at once: parameters live in typed arrays, areas are one call per shape class
+    shapes = ShapeCollection([circle, Square("blue", 3), Rectangle("green", 2, 5)])
+    shapes.add_many(Circle, "yellow", [1.0, 0.5, 10.0])
+    print(shapes.area().tolist())  # [12.56636, 9.0, 10.0, 3.14159, 0.7853975, 314.159]
+    print([shape.describe() for shape in shapes][-1])  # A yellow shape
@@ -0,0 +1,112 @@
+"""
+Benchmarks for the shapes in Abstract.py.
+
+Run it directly:
+    python Abstract_benchmark.py
+
+Compares one million circles stored three ways. The first is objects with a
+__dict__, which is what Circle was before __slots__. The second is Circle
+objects with __slots__. The third is a ShapeCollection holding the radii in
+a typed array. For each way it reports the memory held and the time taken to
+compute every area.
+
+It also checks that a subclass of Circle that adds state and overrides
+area() is kept as objects rather than stored as a plain circle.
+"""
+import random
+import time
+import tracemalloc
+
+from Abstract import PI, Circle, Rectangle, ShapeCollection
+
+
+class _DictCircle:
+    # Circle as it was before __slots__
+    def __init__(self, color, radius):
+        self.color = color
+        self.radius = radius
+
+    def area(self):
+        return PI * (self.radius * self.radius)
+
+
+def _measure(build):
+    # Memory held by what build returns, and the time build took
+    tracemalloc.start()
+    start = time.perf_counter()
+    shapes = build()
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return shapes, size, seconds
+
+
+def benchmark_circles(count=1_000_000):
+    """
+    Prints bytes per circle and area throughput for each representation.
+    """
+    rng = random.Random(0)
+    radii = [rng.uniform(0.1, 10) for _ in range(count)]
+
+    def build_collection():
+        shapes = ShapeCollection()
+        shapes.add_many(Circle, "red", radii)
+        return shapes
+
+    variants = (
+        ("objects with __dict__", lambda: [_DictCircle("red", radius) for radius in radii]),
+        ("objects with __slots__", lambda: [Circle("red", radius) for radius in radii]),
+        ("ShapeCollection", build_collection),
+    )
+    expected = None
+    for name, build in variants:
+        shapes, size, _ = _measure(build)
+        start = time.perf_counter()
+        if isinstance(shapes, ShapeCollection):
+            areas = shapes.area()
+            seconds = time.perf_counter() - start
+            areas = areas.tolist()
+        else:
+            areas = [shape.area() for shape in shapes]
+            seconds = time.perf_counter() - start
+        expected = expected or areas
+        assert areas == expected, "areas differ between representations"
+        print(f"  {name:24s} {size / count:6.1f} bytes per circle  {count / seconds:14,.0f} areas/s")
+
+
+class _Ring(Circle):
+    # Inherits parameters and formula from Circle but has its own area
+    __slots__ = ("inner",)
+
+    def __init__(self, color, radius, inner):
+        super().__init__(color, radius)
+        self.inner = inner
+
+    def area(self):
+        return super().area() - self.formula(self.inner)
+
+
+def check_subclass_override():
+    """
+    Checks that a ShapeCollection gives every shape the area its own class computes.
+    """
+    shapes = [Circle("red", 2), _Ring("blue", 2, 1), Rectangle("green", 2, 5), _Ring("black", 3, 2)]
+    collection = ShapeCollection(shapes)
+    areas = collection.area()
+    areas = areas.tolist() if hasattr(areas, "tolist") else list(areas)
+    assert areas == [shape.area() for shape in shapes], areas
+    rebuilt = list(collection)
+    assert [type(shape) for shape in rebuilt] == [type(shape) for shape in shapes]
+    assert rebuilt[1] is shapes[1]
+    try:
+        collection.add_many(_Ring, "white", [2.0], [1.0])
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("add_many stored a subclass with its own area as columns")
+    print("  subclasses overriding area() are kept as objects")
+
+
+if __name__ == "__main__":
+    check_subclass_override()
+    benchmark_circles()
@@ -1,5 +1,19 @@
+import csv  # Lazily parsed CSV catalog files
+import json  # Lazily parsed JSON-lines catalog files
+import os  # CPU count for the default worker pool size
+import time  # High-resolution clock for filter runtime statistics
+import weakref  # Per-filter statistics must not keep filter objects alive
 from abc import ABC, abstractmethod  # Importing Abstract Base Class (ABC) and abstractmethod decorator
-from typing import List, Set  # Importing List and Set types for type hints
+from bisect import bisect_left, insort  # Binary search helpers for the sorted page-count index
+from collections import deque  # Submission-ordered queue of pending shards
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait  # Process pool for sharded filtering
+from itertools import islice  # Cutting an iterable into shards
+from typing import Dict, Iterable, Iterator, List, Optional, Set  # Importing List and Set types for type hints
+
+try:
+    import numpy as np  # Optional: only needed for the columnar BookCatalog
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
 
 #Strategy Pattern lets you choose from different ways of doing something 
 # (like paying with different methods) 
@@ -23,6 +37,30 @@ class BookFilter(ABC):
         """
         pass
 
+    def mask(self, catalog: "BookCatalog") -> "np.ndarray":
+        """
+        Evaluates the filter over a whole BookCatalog at once.
+        Returns a boolean array with one entry per book in the catalog.
+        The default implementation is the per-row fallback: it materializes
+        each book and calls apply, so filters that only implement apply
+        still work. Concrete filters override it with a columnar version.
+        """
+        return np.fromiter((self.apply(book) for book in catalog), dtype=bool, count=len(catalog))
+
+    def estimate(self, index: "BookIndex") -> Optional[int]:
+        """
+        Returns an upper bound on how many books in the index can pass this
+        filter, or None if the filter cannot use the index.
+        """
+        return None
+
+    def candidates(self, index: "BookIndex") -> Optional[Set[Book]]:
+        """
+        Returns the books in the index that may pass this filter, or None if
+        the filter cannot use the index. Candidates are still checked with apply.
+        """
+        return None
+
 
 # TitleFilter is a concrete class that filters books based on their title
 class TitleFilter(BookFilter):
@@ -36,6 +74,19 @@ class TitleFilter(BookFilter):
         """
         return self.title_keyword.lower() in book.title.lower()
 
+    def mask(self, catalog: "BookCatalog") -> "np.ndarray":
+        """
+        Finds the keyword in the catalog's joined lowercase title column.
+        Every match offset is mapped back to the row that contains it.
+        """
+        return catalog.title_contains(self.title_keyword.lower())
+
+    def estimate(self, index: "BookIndex") -> Optional[int]:
+        return index.estimate_title(self.title_keyword.lower())
+
+    def candidates(self, index: "BookIndex") -> Optional[Set[Book]]:
+        return index.title_candidates(self.title_keyword.lower())
+
 
 # BookSize is a utility class that defines different size categories for books
 class BookSize:
@@ -44,6 +95,14 @@ class BookSize:
     SMALL = "Small"    # Represents books with more than 500 pages
 
 
+# Page count ranges [min_pages, max_pages) for each book size category
+SIZE_RANGES = {
+    BookSize.BIG: (0, 100),
+    BookSize.MEDIUM: (101, 500),
+    BookSize.SMALL: (501, float('inf'))
+}
+
+
 # BookSizeFilter is a concrete class that filters books based on their size
 class BookSizeFilter(BookFilter):
     def __init__(self, desired_size: str):
@@ -54,23 +113,30 @@ class BookSizeFilter(BookFilter):
         Checks if the book's page count falls within the range defined by the desired size.
         Returns True if the book's page count is within the range, otherwise False.
         """
-        # Define the page count ranges for each book size category
-        size_ranges = {
-            BookSize.BIG: (0, 100),
-            BookSize.MEDIUM: (101, 500),
-            BookSize.SMALL: (501, float('inf'))
-        }
-        
-        # Get the min and max pages for the desired size category
-        min_pages, max_pages = size_ranges.get(self.desired_size, (0, float('inf')))
-        
-        # Print statements for debugging purposes
-        print(f"min pages {min_pages} and max_pages {max_pages}")
-        print(f"{min_pages} <= {book.page_count} < {max_pages}")
-        
-        # Check if the book's page count falls within the range
+        # Look up the min and max pages for the desired size category
+        min_pages, max_pages = self.page_range()
         return min_pages <= book.page_count < max_pages
 
+    def page_range(self):
+        """
+        Returns the (min_pages, max_pages) range for the desired size category.
+        """
+        return SIZE_RANGES.get(self.desired_size, (0, float('inf')))
+
+    def mask(self, catalog: "BookCatalog") -> "np.ndarray":
+        """
+        Compares the whole page_count column against the size range in one pass.
+        """
+        min_pages, max_pages = self.page_range()
+        page_counts = catalog.page_counts
+        return (page_counts >= min_pages) & (page_counts < max_pages)
+
+    def estimate(self, index: "BookIndex") -> Optional[int]:
+        return index.count_pages(*self.page_range())
+
+    def candidates(self, index: "BookIndex") -> Optional[Set[Book]]:
+        return index.books_with_pages(*self.page_range())
+
 
 # Function to check if a book passes all the given filters
 def book_passes_filters(book: Book, filters: List[BookFilter]) -> bool:
@@ -84,17 +150,509 @@ def book_passes_filters(book: Book, filters: List[BookFilter]) -> bool:
     return True  # If all filters pass, return True
 
 
+# FilterStatistics collects runtime and selectivity measurements for filters
+class FilterStatistics:
+    """
+    Runtime and selectivity statistics for BookFilter strategies.
+    Measurements come from sampled books on which every filter is evaluated
+    without short-circuiting, so each filter's pass rate is not biased by the
+    filters that ran before it. Statistics are kept per filter instance (to
+    order a chain) and per filter class (to see which strategies dominate
+    query time and to give new instances a starting estimate). Filters that
+    cannot be hashed or weakly referenced (e.g. a filter defining __eq__
+    without __hash__) only get the per-class statistics.
+    """
+    def __init__(self):
+        self._by_filter = weakref.WeakKeyDictionary()  # BookFilter -> [calls, passes, seconds]
+        self._by_strategy = {}  # Filter class name -> [calls, passes, seconds]
+
+    def record(self, book_filter: BookFilter, passed: bool, seconds: float) -> None:
+        """
+        Records one evaluation of book_filter.
+        """
+        records = [self._by_strategy.setdefault(type(book_filter).__name__, [0, 0, 0.0])]
+        try:
+            record = self._by_filter.get(book_filter)
+            if record is None:
+                record = self._by_filter[book_filter] = [0, 0, 0.0]
+            records.append(record)
+        except TypeError:
+            pass  # Unhashable or not weakly referenceable: class statistics only
+        for record in records:
+            record[0] += 1
+            record[1] += passed
+            record[2] += seconds
+
+    def evaluate(self, book: Book, filters: List[BookFilter]) -> bool:
+        """
+        Applies every filter to the book, timing each one, and records the results.
+        Returns True if the book passes all filters.
+        """
+        clock = time.perf_counter
+        result = True
+        for book_filter in filters:
+            start = clock()
+            passed = bool(book_filter.apply(book))
+            self.record(book_filter, passed, clock() - start)
+            result = result and passed
+        return result
+
+    def rank(self, book_filter: BookFilter) -> float:
+        """
+        Returns the expected cost of the filter per book it rejects.
+        Filters with a lower rank should run first. Unmeasured filters rank 0,
+        so they run early and get measured.
+        """
+        try:
+            record = self._by_filter.get(book_filter)
+        except TypeError:  # Unhashable or not weakly referenceable
+            record = None
+        record = record or self._by_strategy.get(type(book_filter).__name__)
+        if record is None:
+            return 0.0
+        calls, passes, seconds = record
+        rejection_rate = 1.0 - passes / calls
+        if rejection_rate <= 0.0:
+            return float('inf')  # Never rejects anything: run it last
+        return (seconds / calls) / rejection_rate
+
+    def order(self, filters: List[BookFilter]) -> List[BookFilter]:
+        """
+        Returns the filters sorted so cheap, selective filters come first.
+        """
+        return sorted(filters, key=self.rank)
+
+    def summary(self) -> List[Dict[str, float]]:
+        """
+        Returns per-strategy statistics, the most time-consuming strategy first.
+        """
+        rows = []
+        for name, (calls, passes, seconds) in self._by_strategy.items():
+            rows.append({
+                "strategy": name,
+                "calls": calls,
+                "pass_rate": passes / calls,
+                "total_seconds": seconds,
+                "avg_seconds": seconds / calls,
+            })
+        rows.sort(key=lambda row: row["total_seconds"], reverse=True)
+        return rows
+
+    def reset(self) -> None:
+        self._by_filter = weakref.WeakKeyDictionary()
+        self._by_strategy = {}
+
+
+# Statistics shared by every filter_books call that does not pass its own
+filter_statistics = FilterStatistics()
+
+
+def get_filter_statistics() -> List[Dict[str, float]]:
+    """
+    Returns the per-strategy statistics gathered by filter_books so far.
+    """
+    return filter_statistics.summary()
+
+
 # Function to filter a list of books based on a list of filters
-def filter_books(book_list: List[Book], filters: List[BookFilter]) -> Set[Book]:
+def filter_books(book_list: List[Book], filters: List[BookFilter],
+                 stats: Optional[FilterStatistics] = None, sample_every: int = 16) -> Set[Book]:
     """
     Filters a list of books using the provided list of filters.
     Returns a set of books that satisfy all filters.
+    When book_list is a BookIndex, the most selective indexed filter picks the
+    candidate books and only the remaining filters are checked against them.
+    Every sample_every-th book is evaluated by all filters with timing; the
+    chain is then reordered so cheap, selective filters run first.
+    """
+    return set(iter_filter_books(book_list, filters, stats, sample_every))
+
+
+# Generator version of filter_books that yields matches as they are found
+def iter_filter_books(books: Iterable[Book], filters: List[BookFilter],
+                      stats: Optional[FilterStatistics] = None, sample_every: int = 16) -> Iterator[Book]:
+    """
+    Streams the books that satisfy all filters.
+    Accepts any iterable, such as read_books_csv or read_books_jsonl over a
+    catalog file, and never holds more than one book at a time.
     """
-    filtered_books = set()  # Initialize an empty set to store filtered books
-    for book in book_list:
-        if book_passes_filters(book, filters):  # If the book passes all filters, add it to the set
-            filtered_books.add(book)
-    return filtered_books  # Return the set of filtered books
+    if stats is None:
+        stats = filter_statistics
+    if isinstance(books, BookIndex):
+        books, filters = plan_indexed_query(books, filters)
+    for _, book in _iter_matches(books, filters, stats, sample_every):
+        yield book
+
+
+def _iter_matches(books: Iterable[Book], filters: List[BookFilter],
+                  stats: FilterStatistics, sample_every: int) -> Iterator:
+    # Yields (position, book) for every match, reordering the chain on sampled books
+    chain = stats.order(filters)
+    for position, book in enumerate(books):
+        if position % sample_every == 0:
+            passed = stats.evaluate(book, chain)
+            chain = stats.order(chain)
+        else:
+            passed = book_passes_filters(book, chain)
+        if passed:
+            yield position, book
+
+
+# Readers that parse catalog files lazily, one book per row
+def read_books_csv(path: str) -> Iterator[Book]:
+    """
+    Yields a Book for every row of a CSV file with title and page_count columns.
+    """
+    with open(path, newline="", encoding="utf-8") as catalog_file:
+        for row in csv.DictReader(catalog_file):
+            yield Book(row["title"], int(row["page_count"]))
+
+
+def read_books_jsonl(path: str) -> Iterator[Book]:
+    """
+    Yields a Book for every line of a JSON-lines file of {"title", "page_count"} objects.
+    """
+    with open(path, encoding="utf-8") as catalog_file:
+        for line in catalog_file:
+            if line.strip():
+                record = json.loads(line)
+                yield Book(record["title"], int(record["page_count"]))
+
+
+def _filter_shard(shard: List[Book], filters: List[BookFilter], sample_every: int) -> List[int]:
+    # Runs in a worker process. Only the positions of the matches are sent
+    # back, so the parent does not receive the books a second time.
+    # Statistics are worker-local: they do not travel back to the parent.
+    stats = FilterStatistics()
+    return [position for position, _ in _iter_matches(shard, filters, stats, sample_every)]
+
+
+# Function to filter books in shards across a pool of worker processes
+def filter_books_parallel(books: Iterable[Book], filters: List[BookFilter], shard_size: int = 10000,
+                          workers: Optional[int] = None, ordered: bool = False,
+                          sample_every: int = 16) -> Iterator[Book]:
+    """
+    Splits books into shards of shard_size and filters them in a process pool.
+    Yields matches shard by shard: in input order when ordered is True,
+    otherwise as soon as each shard finishes. At most two shards per worker
+    are in flight, so a lazily read catalog is never fully loaded.
+    Books and filters are sent to the workers, so both must be picklable.
+    """
+    books = iter(books)
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()  # (future, shard) in submission order
+
+        def submit_next() -> bool:
+            shard = list(islice(books, shard_size))
+            if not shard:
+                return False
+            pending.append((executor.submit(_filter_shard, shard, filters, sample_every), shard))
+            return True
+
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                exhausted = not submit_next()
+            if not pending:
+                break
+            if ordered:
+                future, shard = pending.popleft()
+            else:
+                done, _ = wait([future for future, _ in pending], return_when=FIRST_COMPLETED)
+                for position, (future, shard) in enumerate(pending):
+                    if future in done:
+                        del pending[position]
+                        break
+            for position in future.result():
+                yield shard[position]
+
+
+# Function to choose which filter drives an indexed query
+def plan_indexed_query(index: "BookIndex", filters: List[BookFilter]):
+    """
+    Picks the indexed filter with the smallest estimated result size.
+    Returns the candidate books and the filters that still need to be applied.
+    Filters that cannot use the index are kept and checked per candidate.
+    """
+    best_filter = None
+    best_estimate = None
+    for book_filter in filters:
+        estimate = book_filter.estimate(index)
+        if estimate is not None and (best_estimate is None or estimate < best_estimate):
+            best_filter, best_estimate = book_filter, estimate
+
+    if best_filter is None:
+        return list(index), list(filters)  # No indexed filter: scan every book
+
+    # The driving filter is checked again because an index may return false
+    # positives (the n-gram index does)
+    remaining = [best_filter] + [book_filter for book_filter in filters if book_filter is not best_filter]
+    return best_filter.candidates(index), remaining
+
+
+# BookIndex keeps secondary indexes over a book collection up to date as books change
+class BookIndex:
+    """
+    Incrementally indexed book collection.
+    A sorted (page_count, sequence) list answers page-count range queries with
+    binary search, and an inverted n-gram index over lowercase titles narrows
+    substring searches down to a small candidate set. add and remove update the
+    indexes in place, so there is never a full rebuild.
+    """
+    NGRAM = 3  # Length of the title n-grams stored in the inverted index
+
+    def __init__(self, books: Iterable[Book] = ()):
+        self._sequence = {}  # Book -> insertion sequence number
+        self._books = {}  # Insertion sequence number -> Book
+        self._next_sequence = 0
+        self._pages = []  # Sorted list of (page_count, sequence)
+        self._grams = {}  # Lowercase n-gram -> set of books whose title contains it
+        self._short_titles = set()  # Books whose title is shorter than NGRAM
+        for book in books:
+            self.add(book)
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    def __iter__(self) -> Iterator[Book]:
+        return iter(list(self._books.values()))
+
+    def __contains__(self, book: Book) -> bool:
+        return book in self._sequence
+
+    def _title_grams(self, title: str) -> Set[str]:
+        n = self.NGRAM
+        return {title[i:i + n] for i in range(len(title) - n + 1)}
+
+    def add(self, book: Book) -> None:
+        """
+        Adds a book and updates both indexes.
+        """
+        if book in self._sequence:
+            return
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        self._sequence[book] = sequence
+        self._books[sequence] = book
+        insort(self._pages, (book.page_count, sequence))
+
+        title = book.title.lower()
+        if len(title) < self.NGRAM:
+            self._short_titles.add(book)
+        for gram in self._title_grams(title):
+            self._grams.setdefault(gram, set()).add(book)
+
+    def remove(self, book: Book) -> None:
+        """
+        Removes a book and updates both indexes.
+        Raises KeyError if the book is not in the index.
+        """
+        sequence = self._sequence.pop(book)
+        del self._books[sequence]
+        del self._pages[bisect_left(self._pages, (book.page_count, sequence))]
+
+        title = book.title.lower()
+        self._short_titles.discard(book)
+        for gram in self._title_grams(title):
+            postings = self._grams[gram]
+            postings.discard(book)
+            if not postings:
+                del self._grams[gram]
+
+    def _page_bounds(self, min_pages, max_pages):
+        # (page_count, -1) sorts before every entry with that page count
+        return bisect_left(self._pages, (min_pages, -1)), bisect_left(self._pages, (max_pages, -1))
+
+    def count_pages(self, min_pages, max_pages) -> int:
+        """
+        Returns how many books have min_pages <= page_count < max_pages.
+        """
+        low, high = self._page_bounds(min_pages, max_pages)
+        return max(high - low, 0)
+
+    def books_with_pages(self, min_pages, max_pages) -> Set[Book]:
+        """
+        Returns the books with min_pages <= page_count < max_pages.
+        """
+        low, high = self._page_bounds(min_pages, max_pages)
+        books = self._books
+        return {books[sequence] for _, sequence in self._pages[low:high]}
+
+    def _keyword_postings(self, keyword: str) -> Optional[List[Set[Book]]]:
+        # Posting sets that every title containing keyword must be in.
+        # None means the keyword is too short to narrow anything down by itself.
+        if len(keyword) < self.NGRAM:
+            return None
+        return [self._grams.get(gram, set()) for gram in self._title_grams(keyword)]
+
+    def estimate_title(self, keyword: str) -> int:
+        """
+        Returns an upper bound on how many titles contain keyword.
+        """
+        postings = self._keyword_postings(keyword)
+        if postings is None:
+            return len(self._books)
+        return min(len(books) for books in postings)
+
+    def title_candidates(self, keyword: str) -> Set[Book]:
+        """
+        Returns the books whose title may contain keyword.
+        Long keywords intersect the posting sets of their n-grams, smallest
+        first. Short keywords take the union of every n-gram that contains
+        them plus the titles too short to have any n-gram.
+        """
+        postings = self._keyword_postings(keyword)
+        if postings is None:
+            if not keyword:
+                return set(self._books.values())
+            candidates = set(self._short_titles)
+            for gram, books in self._grams.items():
+                if keyword in gram:
+                    candidates |= books
+            return candidates
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for books in postings[1:]:
+            if not candidates:
+                break
+            candidates &= books
+        return candidates
+
+
+# BookCatalog stores a large collection of books as columns instead of Book objects
+class BookCatalog:
+    """
+    Column-oriented book collection for large catalogs.
+    Titles are kept in a list and page counts in a numpy array, so filters can
+    evaluate whole columns as boolean masks instead of calling apply per book.
+    Book objects are only created when a row is actually read.
+    """
+    # Separator used to join the lowercase titles into one searchable string
+    SEPARATOR = "\x00"
+
+    def __init__(self, books: Iterable[Book] = ()):
+        if np is None:
+            raise ImportError("BookCatalog requires numpy")
+        titles = []
+        page_counts = []
+        for book in books:
+            titles.append(book.title)
+            page_counts.append(book.page_count)
+        self.titles = titles  # Title column
+        self.page_counts = np.asarray(page_counts, dtype=np.int64)  # Page count column
+        self._title_text = None  # Joined lowercase titles, built on first title search
+        self._title_starts = None  # Offset of each title inside _title_text
+
+    @classmethod
+    def from_columns(cls, titles: List[str], page_counts) -> "BookCatalog":
+        """
+        Builds a catalog directly from a title list and a page count sequence,
+        without creating intermediate Book objects.
+        """
+        if len(titles) != len(page_counts):
+            raise ValueError("titles and page_counts must have the same length")
+        catalog = cls()
+        catalog.titles = list(titles)
+        catalog.page_counts = np.asarray(page_counts, dtype=np.int64)
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __getitem__(self, index: int) -> Book:
+        return Book(self.titles[index], int(self.page_counts[index]))
+
+    def __iter__(self) -> Iterator[Book]:
+        for title, page_count in zip(self.titles, self.page_counts.tolist()):
+            yield Book(title, page_count)
+
+    def title_contains(self, keyword: str) -> "np.ndarray":
+        """
+        Returns a boolean mask of the rows whose lowercase title contains keyword.
+        The search runs str.find over one joined string, so the scanning happens
+        in C rather than in a Python loop over rows.
+        """
+        if self.SEPARATOR in keyword:
+            # A keyword spanning the separator could match across two titles
+            return np.fromiter((keyword in title.lower() for title in self.titles),
+                               dtype=bool, count=len(self))
+        if self._title_text is None:
+            lowered = [title.lower() for title in self.titles]
+            lengths = np.fromiter((len(title) + 1 for title in lowered), dtype=np.int64, count=len(lowered))
+            self._title_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+            self._title_text = self.SEPARATOR.join(lowered)
+
+        result = np.zeros(len(self), dtype=bool)
+        if not keyword:
+            result[:] = True
+            return result
+        text = self._title_text
+        offsets = []
+        find = text.find
+        position = find(keyword)
+        while position != -1:
+            offsets.append(position)
+            row_end = text.find(self.SEPARATOR, position)
+            if row_end == -1:
+                break
+            # Skip to the next title: one match per row is enough
+            position = find(keyword, row_end + 1)
+        if offsets:
+            rows = np.searchsorted(self._title_starts, offsets, side="right") - 1
+            result[rows] = True
+        return result
+
+    def filter(self, filters: List[BookFilter]) -> "CatalogView":
+        """
+        Evaluates every filter as a whole-column mask and ANDs the masks together.
+        Returns a lazy view over the matching rows.
+        """
+        combined = np.ones(len(self), dtype=bool)
+        for book_filter in filters:
+            combined &= book_filter.mask(self)
+            if not combined.any():  # Nothing left to narrow down
+                break
+        return CatalogView(self, np.flatnonzero(combined))
+
+
+# CatalogView is a lazy, read-only view over selected rows of a BookCatalog
+class CatalogView:
+    def __init__(self, catalog: BookCatalog, indices: "np.ndarray"):
+        self.catalog = catalog  # The catalog the rows belong to
+        self.indices = indices  # Row numbers of the matching books
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, position: int) -> Book:
+        return self.catalog[int(self.indices[position])]
+
+    def __iter__(self) -> Iterator[Book]:
+        titles = self.catalog.titles
+        page_counts = self.catalog.page_counts
+        for index in self.indices.tolist():
+            yield Book(titles[index], int(page_counts[index]))
+
+    @property
+    def titles(self) -> List[str]:
+        titles = self.catalog.titles
+        return [titles[index] for index in self.indices.tolist()]
+
+    @property
+    def page_counts(self) -> "np.ndarray":
+        return self.catalog.page_counts[self.indices]
+
+
+# Function to filter a BookCatalog based on a list of filters
+def filter_catalog(catalog: BookCatalog, filters: List[BookFilter]) -> CatalogView:
+    """
+    Columnar counterpart of filter_books.
+    Returns a lazy view of the matching rows instead of a set of Book objects.
+    """
+    return catalog.filter(filters)
 
 
 # Example Usage: Demonstrating how to filter books using the defined filters
@@ -116,3 +674,22 @@ if __name__ == "__main__":
     # Print the filtered books
     for book in filtered_books:
         print(f"Book: {book.title}, Pages: {book.page_count}")
+
+    # The same query over an indexed collection only checks the candidate books
+    index = BookIndex(books)
+    for book in filter_books(index, filters):
+        print(f"Indexed book: {book.title}, Pages: {book.page_count}")
+
+    # Runtime and selectivity of each filter strategy seen so far
+    for row in get_filter_statistics():
+        print(f"{row['strategy']}: {row['calls']} calls, pass rate {row['pass_rate']:.2f}")
+
+    # Sharded evaluation in a process pool, keeping the input order
+    for book in filter_books_parallel(books, filters, shard_size=2, workers=2, ordered=True):
+        print(f"Sharded book: {book.title}, Pages: {book.page_count}")
+
+    # The same query over a columnar catalog returns a lazy view of matching rows
+    if np is not None:
+        catalog = BookCatalog(books)
+        for book in filter_catalog(catalog, filters):
+            print(f"Catalog book: {book.title}, Pages: {book.page_count}")
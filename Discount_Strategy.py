@@ -1,3 +1,30 @@
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; bulk pricing then loops in Python
+    np = None
+
+# Rounding policy
+# Final prices are rounded to whole cents, halves to even, on the float64 result
+# of the discount: round(x * 100) / 100. The bulk path performs the very same
+# float64 operations (np.rint also rounds halves to even), so a price priced in
+# bulk is bit-for-bit equal to the same price priced one order at a time.
+def round_price(price):
+    return round(price * 100) / 100
+
+def round_prices(prices):
+    # Vectorized round_price for a numpy array of prices
+    return np.rint(prices * 100) / 100
+
+def price_column(prices):
+    # Turn any sequence of prices into the column type the bulk path works on:
+    # a float64 numpy array, or an array('d') when numpy is not installed
+    if np is not None:
+        return np.asarray(prices, dtype=np.float64)
+    return prices if isinstance(prices, array) and prices.typecode == "d" else array("d", prices)
+
 # Strategy interface
 class DiscountStrategy:
     
@@ -6,21 +33,247 @@ class DiscountStrategy:
         # This method will apply a discount to the given price.
         pass  # Placeholder method, to be overridden by subclasses.
 
+    def apply_discount_bulk(self, prices):
+        # Apply the discount to a whole column of prices and return a new column
+        # (see price_column). This default calls apply_discount for every price;
+        # strategies that can work on the whole column at once override it.
+        prices = price_column(prices)
+        return price_column([self.apply_discount(float(price)) for price in prices])
+
+    def group_key(self):
+        # Orders whose strategies have equal keys are priced together by OrderBatch.
+        # By default every strategy instance is its own group; strategies without
+        # state return their class, so separate instances share one group.
+        return self
+
+    def affine(self):
+        # Strategies whose discount is price * multiplier + offset (before rounding)
+        # return (multiplier, offset), so DiscountPipeline can fold them with their
+        # neighbours. Anything else returns None and is called as it is.
+        return None
+
 # Concrete strategies
-class RegularDiscount(DiscountStrategy):
-    def apply_discount(self, price):
-        # Apply a regular discount of 10% to the price.
-        return price * 0.90  # 10% off
+class PercentageDiscount(DiscountStrategy):
+    # Base for strategies that take a fixed fraction off the price
+    factor = 1.0  # What is left of the price after the discount
 
-class ChristmasDiscount(DiscountStrategy):
     def apply_discount(self, price):
-        # Apply a Christmas discount of 20% to the price.
-        return price * 0.80  # 20% off
+        return round_price(price * self.factor)
+
+    def apply_discount_bulk(self, prices):
+        prices = price_column(prices)
+        if np is None:
+            return array("d", (round_price(price * self.factor) for price in prices))
+        return round_prices(prices * self.factor)
+
+    def group_key(self):
+        return type(self)
+
+    def affine(self):
+        return self.factor, 0.0
+
+class RegularDiscount(PercentageDiscount):
+    # Apply a regular discount of 10% to the price.
+    factor = 0.90  # 10% off
+
+class ChristmasDiscount(PercentageDiscount):
+    # Apply a Christmas discount of 20% to the price.
+    factor = 0.80  # 20% off
 
 class NoDiscount(DiscountStrategy):
     def apply_discount(self, price):
-        # Apply no discount, return the price as is.
-        return price  # No discount
+        # Apply no discount, return the price as is (rounded to cents).
+        return round_price(price)  # No discount
+
+    def apply_discount_bulk(self, prices):
+        prices = price_column(prices)
+        if np is None:
+            return array("d", (round_price(price) for price in prices))
+        return round_prices(prices)
+
+    def group_key(self):
+        return type(self)
+
+    def affine(self):
+        return 1.0, 0.0
+
+# Pipeline rules
+class DiscountRule(DiscountStrategy):
+    # Base for the building blocks of a DiscountPipeline. A rule on its own is a
+    # strategy too: it prices like a pipeline holding just that rule.
+    _pipeline = None
+
+    def _single(self):
+        if self._pipeline is None:
+            self._pipeline = DiscountPipeline(self)
+        return self._pipeline
+
+    def apply_discount(self, price):
+        return self._single().apply_discount(price)
+
+    def apply_discount_bulk(self, prices):
+        return self._single().apply_discount_bulk(prices)
+
+class PercentageOff(DiscountRule):
+    # Take a percentage off the price.
+    def __init__(self, percent):
+        self.percent = percent
+
+    def affine(self):
+        return 1 - self.percent / 100, 0.0
+
+class FixedAmountOff(DiscountRule):
+    # Take a fixed amount off the price.
+    def __init__(self, amount):
+        self.amount = amount
+
+    def affine(self):
+        return 1.0, -float(self.amount)
+
+class PriceFloor(DiscountRule):
+    # Never let the price drop below minimum at this point of the pipeline.
+    def __init__(self, minimum):
+        self.minimum = minimum
+
+class DiscountCap(DiscountRule):
+    # Cap the total discount: the price may end up at most max_discount below
+    # the price the pipeline started with.
+    def __init__(self, max_discount):
+        self.max_discount = max_discount
+
+class MinimumSpend(DiscountRule):
+    # Conditional rule: apply rules only when the price at this point of the
+    # pipeline is at least threshold.
+    def __init__(self, threshold, *rules):
+        self.threshold = threshold
+        self.rules = rules
+
+# Pipeline
+class DiscountPipeline(DiscountStrategy):
+    # Applies rules (and any other DiscountStrategy) one after another, rounding
+    # once at the end with round_price and never going below zero.
+    #
+    # The rules are compiled once, when the pipeline is built:
+    # - runs of affine rules (percentages, fixed amounts, the percentage strategies
+    #   above) are folded into a single price * multiplier + offset, and
+    #   identities are dropped;
+    # - the resulting plan is turned into the source of one Python function with
+    #   the constants inlined, so pricing an order is a single call without any
+    #   per-rule dispatch. Infinite constants (a DiscountCap(math.inf) meaning
+    #   "no cap") are written as inf, which the function's namespace defines;
+    #   NaN is rejected with a ValueError.
+    # apply_discount_bulk runs the same plan on whole numpy columns, with the same
+    # float64 operations in the same order, so both paths agree exactly.
+    # Folding changes the float64 arithmetic slightly compared with applying the
+    # rules one by one, so prices can differ by a cent on exact half-cent ties;
+    # strategies used inside a pipeline are not rounded separately either.
+    def __init__(self, *rules):
+        self.rules = rules
+        self.plan = self._fold(rules)
+        self.source, strategies = self._generate(self.plan)
+        namespace = {"strategies": strategies, "inf": math.inf}
+        exec(self.source, namespace)
+        self.apply_discount = namespace["price"]  # The compiled pricing function
+
+    @classmethod
+    def _fold(cls, rules):
+        # Returns the plan: a list of steps
+        #   ("affine", multiplier, offset), ("floor", minimum), ("cap", max_discount),
+        #   ("when", threshold, plan) and ("strategy", strategy)
+        plan = []
+        for rule in rules:
+            affine = rule.affine()
+            if affine is not None:
+                multiplier, offset = float(affine[0]), float(affine[1])
+                if plan and plan[-1][0] == "affine":
+                    # (x * m1 + b1) * m2 + b2 == x * (m1 * m2) + (b1 * m2 + b2)
+                    _, previous_multiplier, previous_offset = plan.pop()
+                    multiplier, offset = previous_multiplier * multiplier, previous_offset * multiplier + offset
+                if (multiplier, offset) != (1.0, 0.0):
+                    plan.append(("affine", multiplier, offset))
+            elif isinstance(rule, PriceFloor):
+                if plan and plan[-1][0] == "floor":
+                    plan.append(("floor", max(plan.pop()[1], float(rule.minimum))))
+                else:
+                    plan.append(("floor", float(rule.minimum)))
+            elif isinstance(rule, DiscountCap):
+                plan.append(("cap", float(rule.max_discount)))
+            elif isinstance(rule, MinimumSpend):
+                inner = cls._fold(rule.rules)
+                if inner:
+                    plan.append(("when", float(rule.threshold), inner))
+            else:
+                plan.append(("strategy", rule))
+        return plan
+
+    @classmethod
+    def _generate(cls, plan):
+        # Returns the source of the pricing function and the strategies it calls
+        lines = ["def price(x):", "    original = x"]
+        strategies = []
+
+        def literal(value):
+            # repr gives "inf" and "-inf" for infinities, resolved through the namespace
+            if math.isnan(value):
+                raise ValueError("discount rules cannot use NaN")
+            return repr(value)
+
+        def emit(steps, indent):
+            pad = " " * indent
+            for step in steps:
+                if step[0] == "affine":
+                    _, multiplier, offset = step
+                    if multiplier != 1.0:
+                        lines.append(f"{pad}x = x * {literal(multiplier)}")
+                    if offset != 0.0:
+                        lines.append(f"{pad}x = x + {literal(offset)}")
+                elif step[0] == "floor":
+                    lines.append(f"{pad}if x < {literal(step[1])}:")
+                    lines.append(f"{pad}    x = {literal(step[1])}")
+                elif step[0] == "cap":
+                    lines.append(f"{pad}if x < original - {literal(step[1])}:")
+                    lines.append(f"{pad}    x = original - {literal(step[1])}")
+                elif step[0] == "when":
+                    lines.append(f"{pad}if x >= {literal(step[1])}:")
+                    emit(step[2], indent + 4)
+                else:
+                    lines.append(f"{pad}x = strategies[{len(strategies)}].apply_discount(x)")
+                    strategies.append(step[1])
+
+        emit(plan, 4)
+        lines.append("    if x < 0.0:")
+        lines.append("        x = 0.0")
+        lines.append("    return round(x * 100) / 100")
+        return "\n".join(lines) + "\n", strategies
+
+    def apply_discount_bulk(self, prices):
+        prices = price_column(prices)
+        if np is None:
+            return array("d", map(self.apply_discount, prices))
+        prices = self._run_bulk(self.plan, prices, prices)
+        return round_prices(np.maximum(prices, 0.0))
+
+    @classmethod
+    def _run_bulk(cls, plan, prices, original):
+        for step in plan:
+            if step[0] == "affine":
+                _, multiplier, offset = step
+                if multiplier != 1.0:
+                    prices = prices * multiplier
+                if offset != 0.0:
+                    prices = prices + offset
+            elif step[0] == "floor":
+                prices = np.maximum(prices, step[1])
+            elif step[0] == "cap":
+                prices = np.maximum(prices, original - step[1])
+            elif step[0] == "when":
+                selected = prices >= step[1]
+                if selected.any():
+                    prices = prices.copy()
+                    prices[selected] = cls._run_bulk(step[2], prices[selected], original[selected])
+            else:
+                prices = price_column(step[1].apply_discount_bulk(prices))
+        return prices
 
 # Context
 class Order:
@@ -34,6 +287,55 @@ class Order:
         return self.discount_strategy.apply_discount(self.price)
         # Returns the final price after applying the discount.
 
+# Batch context
+class OrderBatch:
+    # Holds many orders as two columns, the prices and a small integer code naming
+    # each order's strategy, and prices them one strategy group at a time:
+    # every group goes through a single apply_discount_bulk call.
+    def __init__(self, orders=()):
+        self.prices = array("d")
+        self.codes = array("l")  # Index into self.strategies for every order
+        self.strategies = []  # One representative strategy per group
+        self._code_for_key = {}
+        for order in orders:
+            self.add(order.price, order.discount_strategy)
+
+    def __len__(self):
+        return len(self.prices)
+
+    def add(self, price, discount_strategy):
+        # Add one order, given by its price and discount strategy
+        key = discount_strategy.group_key()
+        code = self._code_for_key.get(key)
+        if code is None:
+            code = self._code_for_key[key] = len(self.strategies)
+            self.strategies.append(discount_strategy)
+        self.prices.append(price)
+        self.codes.append(code)
+
+    def add_column(self, prices, discount_strategy):
+        # Add many orders that share one discount strategy
+        for price in prices:
+            self.add(price, discount_strategy)
+
+    def final_prices(self):
+        # Returns the final price of every order, in the order they were added
+        if np is None:
+            final = array("d", bytes(8 * len(self.prices)))
+            for code, strategy in enumerate(self.strategies):
+                positions = [position for position, order_code in enumerate(self.codes) if order_code == code]
+                discounted = strategy.apply_discount_bulk([self.prices[position] for position in positions])
+                for position, price in zip(positions, discounted):
+                    final[position] = price
+            return final
+        prices = np.frombuffer(self.prices, dtype=np.float64)
+        codes = np.frombuffer(self.codes, dtype=np.dtype("l"))
+        final = np.empty_like(prices)
+        for code, strategy in enumerate(self.strategies):
+            positions = np.flatnonzero(codes == code)
+            final[positions] = strategy.apply_discount_bulk(prices[positions])
+        return final
+
 if __name__ == "__main__":
 
 
@@ -53,3 +355,16 @@ if __name__ == "__main__":
     # Create an order with a price of 100 and apply no discount.
     print(order.get_final_price())  # Output: 100.0
     # Prints the final price without any discount applied.
+
+    # Pricing many orders at once: one pass per strategy instead of one call per order
+    batch = OrderBatch([Order(100, RegularDiscount()), Order(100, ChristmasDiscount()), Order(19.99, NoDiscount())])
+    batch.add_column([10.05, 24.99, 0.5], RegularDiscount())
+    print(batch.final_prices().tolist())  # [90.0, 80.0, 19.99, 9.05, 22.49, 0.45]
+
+    # Stacked promotions: 10% off, then 5 off, then another 20% off orders still
+    # above 50, but never more than 30 off in total and never below 10
+    pipeline = DiscountPipeline(PercentageOff(10), FixedAmountOff(5),
+                                MinimumSpend(50, ChristmasDiscount()), DiscountCap(30), PriceFloor(10))
+    print(pipeline.source)  # The generated pricing function
+    print(Order(100, pipeline).get_final_price())  # 100 * 0.9 - 5 = 85, * 0.8 = 68, capped at 30 off: 70.0
+    print(pipeline.apply_discount_bulk([100, 40, 12, 500]).tolist())  # [70.0, 31.0, 10.0, 470.0]
@@ -0,0 +1,171 @@
+"""
+Benchmarks for bulk pricing in Discount_Strategy.py.
+
+Run it directly:
+    python Discount_Strategy_benchmark.py
+
+Prices the same orders three ways: Order.get_final_price one order at a
+time, an OrderBatch built from the orders, and apply_discount_bulk straight
+on a price column per strategy. Every way must give exactly the same prices.
+
+The pipeline benchmark stacks five promotions. It compares nested strategy
+objects, where every layer is one more Python call per order, with the same
+rules compiled into a DiscountPipeline. A check builds pipelines whose
+limits are infinite ("no cap", "no floor") and compares them with the same
+pipelines without those rules.
+"""
+import math
+import random
+import time
+
+from Discount_Strategy import (ChristmasDiscount, DiscountCap, DiscountPipeline, DiscountStrategy, FixedAmountOff,
+                               MinimumSpend, NoDiscount, Order, OrderBatch, PercentageOff, PriceFloor,
+                               RegularDiscount, price_column, round_price)
+
+
+def _random_orders(count, seed=0):
+    rng = random.Random(seed)
+    strategies = [RegularDiscount(), ChristmasDiscount(), NoDiscount()]
+    return [Order(round(rng.uniform(1, 500), 2), rng.choice(strategies)) for _ in range(count)]
+
+
+def benchmark_bulk_pricing(orders=1_000_000):
+    """
+    Prints orders priced per second for the scalar and the bulk paths.
+    """
+    order_list = _random_orders(orders)
+
+    start = time.perf_counter()
+    scalar = [order.get_final_price() for order in order_list]
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = OrderBatch(order_list)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    bulk = batch.final_prices()
+    batch_seconds = time.perf_counter() - start
+    assert bulk.tolist() == scalar, "bulk prices differ from scalar prices"
+
+    # Columns that are already grouped by strategy, as a repricing job would load them
+    columns = {}
+    for order in order_list:
+        columns.setdefault(type(order.discount_strategy), []).append(order.price)
+    columns = {strategy: price_column(prices) for strategy, prices in columns.items()}
+    start = time.perf_counter()
+    for strategy, prices in columns.items():
+        strategy().apply_discount_bulk(prices)
+    column_seconds = time.perf_counter() - start
+
+    print(f"  scalar get_final_price       {orders / scalar_seconds:14,.0f} orders/s")
+    print(f"  OrderBatch.final_prices      {orders / batch_seconds:14,.0f} orders/s"
+          f"  (building the batch: {orders / build_seconds:,.0f} orders/s)")
+    print(f"  apply_discount_bulk columns  {orders / column_seconds:14,.0f} orders/s")
+
+
+# Stacking promotions without a pipeline: each layer wraps the previous strategy
+class _Base(DiscountStrategy):
+    def apply_discount(self, price):
+        return price
+
+class _NestedPercentageOff(DiscountStrategy):
+    def __init__(self, inner, percent):
+        self.inner = inner
+        self.percent = percent
+
+    def apply_discount(self, price):
+        return self.inner.apply_discount(price) * (1 - self.percent / 100)
+
+class _NestedFixedAmountOff(DiscountStrategy):
+    def __init__(self, inner, amount):
+        self.inner = inner
+        self.amount = amount
+
+    def apply_discount(self, price):
+        return self.inner.apply_discount(price) - self.amount
+
+class _NestedMinimumSpend(DiscountStrategy):
+    def __init__(self, inner, threshold, percent):
+        self.inner = inner
+        self.threshold = threshold
+        self.percent = percent
+
+    def apply_discount(self, price):
+        price = self.inner.apply_discount(price)
+        return price * (1 - self.percent / 100) if price >= self.threshold else price
+
+class _NestedCap(DiscountStrategy):
+    def __init__(self, inner, max_discount):
+        self.inner = inner
+        self.max_discount = max_discount
+
+    def apply_discount(self, price):
+        return max(self.inner.apply_discount(price), price - self.max_discount)
+
+class _Rounded(DiscountStrategy):
+    def __init__(self, inner):
+        self.inner = inner
+
+    def apply_discount(self, price):
+        return round_price(max(self.inner.apply_discount(price), 0.0))
+
+
+def benchmark_pipeline(orders=1_000_000):
+    """
+    Prints orders priced per second for nested strategies and for the same
+    promotions as a compiled DiscountPipeline, scalar and bulk.
+    """
+    rng = random.Random(1)
+    prices = [round(rng.uniform(1, 500), 2) for _ in range(orders)]
+    nested = _Rounded(_NestedCap(_NestedMinimumSpend(_NestedFixedAmountOff(
+        _NestedPercentageOff(_NestedPercentageOff(_Base(), 10), 5), 5), 100, 20), 60))
+    pipeline = DiscountPipeline(PercentageOff(10), PercentageOff(5), FixedAmountOff(5),
+                                MinimumSpend(100, PercentageOff(20)), DiscountCap(60))
+
+    start = time.perf_counter()
+    nested_prices = [Order(price, nested).get_final_price() for price in prices]
+    nested_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pipeline_prices = [Order(price, pipeline).get_final_price() for price in prices]
+    pipeline_seconds = time.perf_counter() - start
+
+    column = price_column(prices)
+    start = time.perf_counter()
+    bulk_prices = pipeline.apply_discount_bulk(column)
+    bulk_seconds = time.perf_counter() - start
+
+    assert bulk_prices.tolist() == pipeline_prices, "bulk and scalar pipeline prices differ"
+    # Folding reorders float64 arithmetic, so only half-cent ties may round differently
+    worst = max(abs(left - right) for left, right in zip(nested_prices, pipeline_prices))
+    assert worst <= 0.0100001, worst
+    print(f"  nested strategies (5 layers)  {orders / nested_seconds:14,.0f} orders/s")
+    print(f"  DiscountPipeline per order    {orders / pipeline_seconds:14,.0f} orders/s")
+    print(f"  DiscountPipeline bulk         {orders / bulk_seconds:14,.0f} orders/s")
+    print(f"  largest difference to nested: {worst:.2f}")
+
+
+def check_infinite_limits():
+    """
+    Checks that infinite caps, floors and thresholds compile and change nothing.
+    """
+    prices = [0.5, 19.99, 100.0, 250.0]
+    plain = DiscountPipeline(PercentageOff(10), FixedAmountOff(5))
+    unlimited = DiscountPipeline(PercentageOff(10), PriceFloor(-math.inf), FixedAmountOff(5),
+                                 MinimumSpend(math.inf, PercentageOff(50)), DiscountCap(math.inf))
+    expected = [plain.apply_discount(price) for price in prices]
+    assert [unlimited.apply_discount(price) for price in prices] == expected
+    assert list(unlimited.apply_discount_bulk(prices)) == expected
+    try:
+        DiscountPipeline(DiscountCap(math.nan))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a NaN limit was accepted")
+    print("  infinite limits compile and leave prices unchanged")
+
+
+if __name__ == "__main__":
+    check_infinite_limits()
+    benchmark_bulk_pricing()
+    benchmark_pipeline()
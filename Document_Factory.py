@@ -1,25 +1,41 @@
+import importlib  # Importing plugin modules the first time their document type is used
+import threading
 from abc import ABC, abstractmethod  # Importing Abstract Base Class and abstractmethod for creating abstract classes
 
 # Abstract Product
 class Document(ABC):
+    # Documents without per-instance state can be shared: the factory then
+    # creates one instance and returns it on every call.
+    stateless = False
+    # Documents whose create is CPU-bound are generated in worker processes by
+    # Document_Factory_Pipeline.py; the rest (I/O-bound) run in threads.
+    cpu_bound = False
+
     @abstractmethod
-    def create(self):
+    def create(self, payload=None):
         # Abstract method that must be implemented by all subclasses
+        # payload carries the content of the document; the built-in types ignore it
         pass
 
 # Concrete Products
 class WordDocument(Document):
-    def create(self):
+    stateless = True
+
+    def create(self, payload=None):
         # Implementation of the create method for Word documents
         return "Word document created."
 
 class PDFDocument(Document):
-    def create(self):
+    stateless = True
+
+    def create(self, payload=None):
         # Implementation of the create method for PDF documents
         return "PDF document created."
 
 class ExcelDocument(Document):
-    def create(self):
+    stateless = True
+
+    def create(self, payload=None):
         # Implementation of the create method for Excel documents
         return "Excel document created."
 
@@ -41,32 +57,137 @@ class DocumentFactory:
     
     3. Factory (DocumentFactory):
 
-    This is a factory class that provides a static method get_document to create and 
+    This is a factory class that provides a class method get_document to create and 
     return instances of different document types based on a string input (doc_type).
     The factory abstracts the creation logic from the client, allowing for more 
     flexibility and easier maintenance.
 
+   4.  Registry:
+
+    Document types are looked up in a dictionary instead of an if/elif chain, so
+    finding a type costs the same however many there are, and new types are
+    added with register instead of by editing the factory. A type can be
+    registered as a "module:Class" string; the module is only imported the first
+    time that type is requested, so backends that are never used never slow
+    down start-up. Stateless documents are created once and that instance is
+    returned afterwards; stateful documents that define reset() can be handed
+    back with release and are reused from a small pool.
+
     Usage:
 
     The client code (inside the if __name__ == "__main__": block) interacts only with 
     the DocumentFactory, not directly with the concrete product classes.
     The factory decides which document to create based on the provided input.
     """
-    @staticmethod
-    def get_document(doc_type):
-        # Static method to get the appropriate document type based on the input string
-        if doc_type == "Word":
-            # If the document type is 'Word', return an instance of WordDocument
-            return WordDocument()
-        elif doc_type == "PDF":
-            # If the document type is 'PDF', return an instance of PDFDocument
-            return PDFDocument()
-        elif doc_type == "Excel":
-            # If the document type is 'Excel', return an instance of ExcelDocument
-            return ExcelDocument()
-        else:
-            # If an unknown document type is provided, raise an error
+    _registry = {}  # doc_type -> Document subclass, or a "module:Class" string not imported yet
+    _instances = {}  # doc_type -> shared instance of a stateless document
+    _pools = {}  # doc_type -> released stateful documents, ready to be reused
+    _lock = threading.Lock()
+    max_pool_size = 32  # Released documents kept per type
+
+    @classmethod
+    def register(cls, doc_type, document_class=None):
+        """
+        Registers a document type, replacing any earlier registration.
+        :param doc_type: The name passed to get_document.
+        :param document_class: A Document subclass, or a "module:Class" string
+                               naming one, imported on first use.
+        Without document_class, returns a class decorator.
+        """
+        if document_class is None:
+            def decorator(document_class):
+                cls.register(doc_type, document_class)
+                return document_class
+            return decorator
+        with cls._lock:
+            cls._registry[doc_type] = document_class
+            cls._instances.pop(doc_type, None)
+            cls._pools.pop(doc_type, None)
+        return document_class
+
+    @classmethod
+    def unregister(cls, doc_type):
+        with cls._lock:
+            cls._registry.pop(doc_type, None)
+            cls._instances.pop(doc_type, None)
+            cls._pools.pop(doc_type, None)
+
+    @classmethod
+    def document_types(cls):
+        return list(cls._registry)
+
+    @classmethod
+    def document_class(cls, doc_type):
+        # Returns the class registered for doc_type, importing it if needed
+        document_class = cls._registry.get(doc_type)
+        if document_class is None:
             raise ValueError(f"Unknown document type: {doc_type}")
+        if isinstance(document_class, str):
+            document_class = cls._load(doc_type)
+        return document_class
+
+    @classmethod
+    def get_document(cls, doc_type):
+        # Class method to get the appropriate document type based on the input string
+        document = cls._instances.get(doc_type)
+        if document is not None:
+            # A stateless document was created before: share it
+            return document
+        # If an unknown document type is provided, this raises a ValueError
+        document_class = cls.document_class(doc_type)
+        if document_class.stateless:
+            with cls._lock:
+                document = cls._instances.get(doc_type)
+                if document is None:
+                    document = cls._instances[doc_type] = document_class()
+            return document
+        pool = cls._pools.get(doc_type)
+        if pool:
+            try:
+                return pool.pop()
+            except IndexError:  # Another thread took the last one
+                pass
+        return document_class()
+
+    @classmethod
+    def release(cls, doc_type, document):
+        """
+        Hands a stateful document back once the caller is done with it. If its
+        class defines reset(), it is reset and returned by a later get_document.
+        """
+        if document.stateless or not hasattr(document, "reset"):
+            return
+        document.reset()
+        with cls._lock:
+            pool = cls._pools.setdefault(doc_type, [])
+            if len(pool) < cls.max_pool_size:
+                pool.append(document)
+
+    @classmethod
+    def _load(cls, doc_type):
+        # Import the module of a type registered as "module:Class" and keep the class.
+        # The import runs without holding _lock: plugin modules may call register
+        # themselves while they are being imported.
+        target = cls._registry.get(doc_type)
+        if not isinstance(target, str):
+            if target is None:
+                raise ValueError(f"Unknown document type: {doc_type}")
+            return target
+        module_name, _, class_name = target.partition(":")
+        document_class = getattr(importlib.import_module(module_name), class_name)
+        if not (isinstance(document_class, type) and issubclass(document_class, Document)):
+            raise TypeError(f"{target} is not a Document subclass")
+        with cls._lock:
+            # Only replace the entry if nobody registered something else meanwhile
+            if cls._registry.get(doc_type) is target:
+                cls._registry[doc_type] = document_class
+                return document_class
+        return cls._load(doc_type)
+
+# The built-in document types
+DocumentFactory.register("Word", WordDocument)
+DocumentFactory.register("PDF", PDFDocument)
+DocumentFactory.register("Excel", ExcelDocument)
 
 if __name__ == "__main__":
     # Usage
@@ -77,3 +198,29 @@ if __name__ == "__main__":
 
     doc = factory.get_document("Word")  # Get a Word document instance from the factory
     print(doc.create())  # Output: Word document created.
+
+    print(factory.get_document("PDF") is factory.get_document("PDF"))  # Output: True, stateless documents are shared
+
+    # New types are registered instead of being added to the factory
+    @DocumentFactory.register("Text")
+    class TextDocument(Document):
+        def __init__(self):
+            self.lines = []  # Per-document state, so every caller gets its own
+
+        def create(self, payload=None):
+            return "Text document created."
+
+        def reset(self):
+            self.lines.clear()
+
+    text = factory.get_document("Text")
+    print(text.create())  # Output: Text document created.
+    factory.release("Text", text)  # Reset and kept for the next caller
+    print(factory.get_document("Text") is text)  # Output: True
+
+    # A "module:Class" string is only imported when the type is first requested
+    DocumentFactory.register("Json", "json:JSONDecoder")
+    try:
+        factory.get_document("Json")
+    except TypeError as error:
+        print(error)  # Output: json:JSONDecoder is not a Document subclass
@@ -0,0 +1,215 @@
+"""
+Batch and parallel document generation on top of Document_Factory.py.
+
+DocumentPipeline takes a stream of (doc_type, payload) jobs, gets each
+document from DocumentFactory and runs its create(payload) in a pool:
+document types marked cpu_bound go to a process pool (so they are not held
+back by the GIL), all others to a thread pool, which suits I/O-bound work.
+
+Jobs are read from the input lazily and at most max_in_flight of them are
+submitted or waiting to be handed out at any time, so a job stream of any
+length is processed in bounded memory. Results come back in job order or as
+soon as they complete.
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from Document_Factory import Document, DocumentFactory
+
+
+class DocumentResult:
+    """
+    The outcome of one job.
+    """
+    __slots__ = ("index", "doc_type", "output", "error")
+
+    def __init__(self, index, doc_type, output=None, error=None):
+        self.index = index  # Position of the job in the input stream
+        self.doc_type = doc_type
+        self.output = output  # What create returned
+        self.error = error  # The exception raised instead, if any
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        outcome = repr(self.output) if self.error is None else f"error={self.error!r}"
+        return f"DocumentResult({self.index}, {self.doc_type!r}, {outcome})"
+
+
+def _create_in_thread(factory, doc_type, payload):
+    # Runs on a pool thread: stateful documents go back to the factory's pool afterwards
+    document = factory.get_document(doc_type)
+    try:
+        return document.create(payload)
+    finally:
+        factory.release(doc_type, document)
+
+
+_process_documents = {}  # Stateless documents already created in this worker process
+
+
+def _create_in_process(document_class, payload):
+    # Runs in a worker process. The class is sent instead of the type name, so
+    # types registered or loaded only in the parent work as well
+    if document_class.stateless:
+        document = _process_documents.get(document_class)
+        if document is None:
+            document = _process_documents[document_class] = document_class()
+    else:
+        document = document_class()
+    return document.create(payload)
+
+
+class DocumentPipeline:
+    """
+    Generates documents for a stream of jobs concurrently.
+    Use it as a context manager, or call close() when done.
+    """
+    def __init__(self, factory=DocumentFactory, threads=8, processes=None, max_in_flight=None, modes=None):
+        """
+        :param factory: Where documents come from.
+        :param threads: Size of the thread pool for I/O-bound document types.
+        :param processes: Size of the process pool for CPU-bound document
+                          types; defaults to the number of CPUs.
+        :param max_in_flight: Most jobs submitted but not yet handed out;
+                              defaults to twice the number of workers.
+        :param modes: Dict mapping doc_type to "thread" or "process", overriding
+                      the cpu_bound flag of the document class.
+        """
+        self.factory = factory
+        self.threads = threads
+        self.processes = processes or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 2 * (self.threads + self.processes)
+        self.modes = dict(modes or {})
+        self._thread_pool = None
+        self._process_pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        # The pools are created on first use and shut down here
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown()
+        self._thread_pool = self._process_pool = None
+
+    def mode(self, doc_type):
+        """
+        Returns "process" or "thread": where jobs of doc_type run.
+        """
+        if doc_type in self.modes:
+            return self.modes[doc_type]
+        return "process" if self.factory.document_class(doc_type).cpu_bound else "thread"
+
+    def _submit(self, doc_type, payload):
+        try:
+            if self.mode(doc_type) == "process":
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+                return self._process_pool.submit(_create_in_process, self.factory.document_class(doc_type), payload)
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.threads)
+            return self._thread_pool.submit(_create_in_thread, self.factory, doc_type, payload)
+        except Exception as error:  # Unknown type, failed plugin import: report it as the job's result
+            future = Future()
+            future.set_exception(error)
+            return future
+
+    def run(self, jobs, ordered=True):
+        """
+        Generates a document for every (doc_type, payload) job.
+        Yields a DocumentResult per job: in job order when ordered is True,
+        otherwise as soon as each one completes.
+        A failing job yields a result with its error and does not stop the others.
+        """
+        jobs = enumerate(jobs)
+        pending = {}  # future -> (job index, doc_type)
+        completed = {}  # job index -> DocumentResult finished ahead of an earlier job
+        next_index = 0  # The job whose result is handed out next in ordered mode
+
+        def submit_next():
+            for index, (doc_type, payload) in jobs:
+                pending[self._submit(doc_type, payload)] = (index, doc_type)
+                return True
+            return False
+
+        # Results held back for ordering count towards the limit too, so a
+        # single slow job cannot let finished results pile up without bound
+        while len(pending) + len(completed) < self.max_in_flight and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, doc_type = pending.pop(future)
+                error = future.exception()
+                result = DocumentResult(index, doc_type, None if error else future.result(), error)
+                if ordered:
+                    completed[index] = result
+                else:
+                    yield result
+            while next_index in completed:
+                yield completed.pop(next_index)
+                next_index += 1
+            while len(pending) + len(completed) < self.max_in_flight and submit_next():
+                pass
+
+    def generate(self, jobs):
+        """
+        Runs all jobs and returns the outputs in job order.
+        Raises the error of the first failed job.
+        """
+        outputs = []
+        for result in self.run(jobs):
+            if result.error is not None:
+                raise result.error
+            outputs.append(result.output)
+        return outputs
+
+
+# Example document types for the demo below
+class ReportDocument(Document):
+    # Rendering a report is pure computation
+    stateless = True
+    cpu_bound = True
+
+    def create(self, payload=None):
+        total = sum(number * number % 7 for number in range(payload or 0))
+        return f"Report over {payload} rows created (checksum {total})."
+
+
+class UploadedDocument(Document):
+    # Storing the document elsewhere mostly waits on the network
+    stateless = True
+
+    def create(self, payload=None):
+        time.sleep(0.01)
+        return f"Document {payload} uploaded."
+
+
+DocumentFactory.register("Report", ReportDocument)
+DocumentFactory.register("Upload", UploadedDocument)
+
+
+if __name__ == "__main__":
+    jobs = [("Upload", number) if number % 4 else ("Report", 200_000) for number in range(200)]
+
+    start = time.perf_counter()
+    sequential = [DocumentFactory.get_document(doc_type).create(payload) for doc_type, payload in jobs]
+    print(f"One at a time: {time.perf_counter() - start:.2f}s")
+
+    with DocumentPipeline(threads=16) as pipeline:
+        start = time.perf_counter()
+        outputs = pipeline.generate(jobs)
+        print(f"Pipeline:      {time.perf_counter() - start:.2f}s")
+        assert outputs == sequential
+
+        # As completed, with a job that fails
+        for result in pipeline.run([("Upload", "a"), ("Spreadsheet", None), ("Word", None)], ordered=False):
+            print(result)
@@ -0,0 +1,163 @@
+"""
+Benchmarks for the DocumentFactory in Document_Factory.py.
+
+Run it directly:
+    python Document_Factory_benchmark.py
+
+Start-up: writes a set of plugin modules to a temporary directory. Each one
+stands in for a heavy document backend by doing some work at import time.
+It then times, in fresh interpreters, the old style (import every backend up
+front and dispatch with if/elif) against the registry (register
+"module:Class" strings, import one backend on first use).
+
+Per call: compares get_document of the old if/elif factory, which builds a
+new document on every call, with the registry, which looks the type up in a
+dict and returns the shared instance of a stateless document.
+
+It also checks that a plugin module which registers its own class while
+it is being imported loads without deadlocking the factory.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+
+from Document_Factory import DocumentFactory, ExcelDocument, PDFDocument, WordDocument
+
+_PLUGIN = '''
+from Document_Factory import Document
+
+# Stands in for the import-time cost of a heavy backend
+_TABLES = [sum(range(n % 500)) for n in range({work})]
+
+class Document{number}(Document):
+    stateless = True
+
+    def create(self, payload=None):
+        return "Document{number} created."
+'''
+
+
+def _write_plugins(directory, backends, work):
+    for number in range(backends):
+        with open(os.path.join(directory, f"doc_backend_{number}.py"), "w") as plugin:
+            plugin.write(_PLUGIN.format(number=number, work=work))
+
+    # The old style: every backend imported at start-up, dispatch by if/elif
+    eager = [f"from doc_backend_{number} import Document{number}" for number in range(backends)]
+    eager.append("def get_document(doc_type):")
+    for number in range(backends):
+        eager.append(f"    {'if' if number == 0 else 'elif'} doc_type == 'Doc{number}':")
+        eager.append(f"        return Document{number}()")
+    eager.append("    raise ValueError(doc_type)")
+    eager.append("print(get_document('Doc0').create())")
+    with open(os.path.join(directory, "eager_start.py"), "w") as script:
+        script.write("\n".join(eager) + "\n")
+
+    with open(os.path.join(directory, "lazy_start.py"), "w") as script:
+        script.write(textwrap.dedent(f"""
+            from Document_Factory import DocumentFactory
+            for number in range({backends}):
+                DocumentFactory.register(f"Doc{{number}}", f"doc_backend_{{number}}:Document{{number}}")
+            print(DocumentFactory.get_document("Doc0").create())
+        """))
+
+
+def _run(directory, script, repeats):
+    # Best wall time of running script in a fresh interpreter
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([directory, os.path.dirname(os.path.abspath(__file__))]),
+                       PYTHONDONTWRITEBYTECODE="1")
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(directory, script)], env=environment, check=True,
+                       stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_startup(backends=40, work=5_000, repeats=3):
+    """
+    Prints the start-up time of a process that uses one document type out of many.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        _write_plugins(directory, backends, work)
+        _run(directory, "lazy_start.py", 1)  # Warm the OS file cache
+        eager = _run(directory, "eager_start.py", repeats)
+        lazy = _run(directory, "lazy_start.py", repeats)
+    print(f"  {backends} backends, eager imports + if/elif  {eager * 1000:8.1f} ms")
+    print(f"  {backends} backends, lazy registry            {lazy * 1000:8.1f} ms")
+
+
+class _ChainFactory:
+    # DocumentFactory.get_document as it was before the registry
+    @staticmethod
+    def get_document(doc_type):
+        if doc_type == "Word":
+            return WordDocument()
+        elif doc_type == "PDF":
+            return PDFDocument()
+        elif doc_type == "Excel":
+            return ExcelDocument()
+        else:
+            raise ValueError(f"Unknown document type: {doc_type}")
+
+
+def benchmark_calls(calls=1_000_000):
+    """
+    Prints the cost of one get_document call for the first and last type of the chain.
+    """
+    for doc_type in ("Word", "Excel"):
+        for name, get_document in (("if/elif chain", _ChainFactory.get_document),
+                                   ("registry", DocumentFactory.get_document)):
+            start = time.perf_counter()
+            for _ in range(calls):
+                get_document(doc_type)
+            seconds = time.perf_counter() - start
+            print(f"  {name:14s} {doc_type:6s} {seconds / calls * 1e9:7.1f} ns per call")
+
+
+_SELF_REGISTERING_PLUGIN = '''
+from Document_Factory import Document, DocumentFactory
+
+@DocumentFactory.register("Fancy")
+class FancyDocument(Document):
+    stateless = True
+
+    def create(self, payload=None):
+        return "Fancy document created."
+'''
+
+
+def check_self_registering_plugin(timeout=5):
+    """
+    Loads a lazily registered plugin that calls DocumentFactory.register on import.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "fancy_plugin.py"), "w") as plugin:
+            plugin.write(_SELF_REGISTERING_PLUGIN)
+        sys.path.insert(0, directory)
+        try:
+            DocumentFactory.register("Fancy", "fancy_plugin:FancyDocument")
+            outputs = []
+            loader = threading.Thread(target=lambda: outputs.append(DocumentFactory.get_document("Fancy").create()),
+                                      daemon=True)
+            loader.start()
+            loader.join(timeout)
+            # A deadlocked loader still holds the factory's lock, so fail before touching it again
+            assert not loader.is_alive(), "loading a self-registering plugin deadlocked"
+            assert outputs == ["Fancy document created."], outputs
+            assert DocumentFactory.document_class("Fancy").__module__ == "fancy_plugin"
+            DocumentFactory.unregister("Fancy")
+        finally:
+            sys.path.remove(directory)
+    print("  a plugin that registers itself on import loads without deadlock")
+
+
+if __name__ == "__main__":
+    check_self_registering_plugin()
+    benchmark_startup()
+    benchmark_calls()
@@ -1,5 +1,147 @@
+import atexit
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+
+# Log levels, lowest to highest
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+_NO_FORMAT = object()  # Marks the one-argument log(message) call
+
+
+class AsyncLogWriter:
+    """
+    Background thread that writes log lines in batches.
+
+    Callers only append a line to a deque, which needs no lock. The writer
+    thread polls the deque and writes lines to the stream in one call per
+    batch: when batch_size lines are waiting, or flush_interval seconds after
+    the oldest unwritten line arrived. The deque is bounded by max_queue; when
+    it is full, overflow decides what the caller does: "block" waits for room
+    (backpressure), "drop" discards the line and counts it in dropped.
+    close() writes everything still queued before the thread stops. Lines
+    that arrive after that are written to stderr and counted in late, since
+    the stream may be closed already; submit never raises into the caller.
+    Queued items are turned into text by formatter on the writer thread.
+    A line that cannot be formatted or a failing stream is reported on
+    stderr and counted in errors; the thread keeps running either way.
+    """
+    BLOCK = "block"
+    DROP = "drop"
+
+    def __init__(self, stream=None, path=None, batch_size=512, flush_interval=0.5,
+                 max_queue=100_000, overflow=BLOCK, formatter=str):
+        if overflow not in (self.BLOCK, self.DROP):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._owns_stream = path is not None
+        self.stream = open(path, "a", encoding="utf-8") if path is not None else (stream or sys.stdout)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.poll_interval = min(flush_interval, 0.01)  # How long the writer sleeps when idle
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.formatter = formatter
+        self.dropped = 0  # Lines discarded because the queue was full
+        self.errors = 0  # Batches that could not be written
+        self.late = 0  # Lines submitted after close, written to stderr
+        self.closed = False
+        self._stopping = False
+        self._lines = deque()
+        self._thread = threading.Thread(target=self._run, name="async-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, line):
+        # line is anything formatter accepts; the Logger submits raw records
+        lines = self._lines
+        if len(lines) >= self.max_queue:
+            if self.overflow == self.DROP:
+                self.dropped += 1
+                return
+            while len(lines) >= self.max_queue and not self.closed:
+                time.sleep(self.poll_interval)  # Backpressure: wait for the writer to catch up
+        if self.closed:
+            self._write_late(line)
+            return
+        lines.append(line)
+        if self.closed and threading.current_thread() is not self._thread:
+            # close() ran between the check and the append: once the writer has
+            # stopped, anything it did not drain is left to this caller
+            self._thread.join()
+            while lines:
+                try:
+                    self._write_late(lines.popleft())
+                except IndexError:  # Another late caller took it
+                    break
+
+    def close(self):
+        """
+        Stop accepting lines, write everything still queued and stop the thread.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._stopping = True
+        self._thread.join()
+        if self._owns_stream:
+            self.stream.close()
+
+    def _format(self, line):
+        try:
+            return self.formatter(line)
+        except Exception as error:
+            return f"<unformattable log line {line!r}: {error!r}>"
+
+    def _write_late(self, line):
+        self.late += 1
+        try:
+            print(self._format(line), file=sys.stderr)
+        except Exception:
+            self.errors += 1
+
+    def _write(self, lines):
+        try:
+            self.stream.write("\n".join(map(self._format, lines)) + "\n")
+            self.stream.flush()
+        except Exception as error:
+            # Like logging's handleError: report it and keep the writer alive
+            self.errors += 1
+            print(f"AsyncLogWriter: could not write {len(lines)} lines: {error!r}", file=sys.stderr)
+
+    def _run(self):
+        lines = self._lines
+        popleft = lines.popleft
+        pending = []
+        deadline = None  # When the oldest pending line must be written
+        while True:
+            stopping = self._stopping
+            while lines and len(pending) < self.batch_size:
+                pending.append(popleft())
+            if pending:
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if stopping or len(pending) >= self.batch_size or time.monotonic() >= deadline:
+                    self._write(pending)
+                    pending = []
+                    deadline = None
+                    continue  # More lines may already be waiting
+            elif stopping and not lines:
+                return
+            time.sleep(self.poll_interval)
+
+
 class Logger:
     _instance = None  # Class-level attribute to hold the single instance of the Logger
+    _lock = threading.Lock()  # Guards instance creation and writer changes across threads
+    _writer = None  # AsyncLogWriter used by log once start_async has been called
+    level = INFO  # Messages below this level are skipped before any formatting
+    structured = False  # Write JSON lines instead of plain text
 
     def __new__(cls, *args, **kwargs):
         """
@@ -12,18 +154,108 @@ class Logger:
 
         While __new__ creates the object, __init__ initializes it. 
         The same pattern can be used in __init__ to ensure that any arguments passed to the constructor are handled properly.
-        
+
+        The check is done twice: once without the lock, so getting the existing
+        instance stays cheap, and once under the lock, so two threads arriving
+        together cannot both create an instance.
         """
         # __new__ is called before __init__, and is responsible for creating a new instance of the class
         if not cls._instance:
-            # If no instance exists, create a new one using the parent class's __new__ method
-            cls._instance = super(Logger, cls).__new__(cls, *args, **kwargs)
+            with cls._lock:
+                if not cls._instance:
+                    # If no instance exists, create a new one using the parent class's __new__ method
+                    cls._instance = super(Logger, cls).__new__(cls, *args, **kwargs)
         # Return the single instance (existing or newly created)
         return cls._instance
 
-    def log(self, message):
-        # A simple method to log a message (in this case, print to console)
-        print(f"Log: {message}")
+    def configure(self, level=None, structured=None):
+        """
+        Set the minimum level and/or switch JSON-lines output on or off.
+        """
+        if level is not None:
+            Logger.level = level
+        if structured is not None:
+            Logger.structured = structured
+
+    def is_enabled_for(self, level):
+        return level >= self.level
+
+    def log(self, level, fmt=_NO_FORMAT, *args):
+        """
+        Log fmt % args at level, e.g. log(WARNING, "%d items left", count).
+        Nothing is formatted when the level is disabled; in async mode the
+        formatting happens on the writer thread, so args should not be
+        mutated after the call. log(message) still logs message at INFO.
+        """
+        if fmt is _NO_FORMAT:
+            level, fmt = INFO, level
+        if level >= self.level:
+            self._emit(level, fmt, args)
+
+    # Shortcuts that check the level before anything else happens
+    def debug(self, fmt, *args):
+        if DEBUG >= self.level:
+            self._emit(DEBUG, fmt, args)
+
+    def info(self, fmt, *args):
+        if INFO >= self.level:
+            self._emit(INFO, fmt, args)
+
+    def warning(self, fmt, *args):
+        if WARNING >= self.level:
+            self._emit(WARNING, fmt, args)
+
+    def error(self, fmt, *args):
+        if ERROR >= self.level:
+            self._emit(ERROR, fmt, args)
+
+    def _emit(self, level, fmt, args):
+        # Print the record, or hand it unformatted to the background writer in async mode
+        record = (time.time(), level, fmt, args)
+        writer = Logger._writer
+        if writer is None:
+            print(self.format_record(record))
+        else:
+            writer.submit(record)
+
+    def format_record(self, record):
+        """
+        Turn a (timestamp, level, fmt, args) record into one line of output.
+        """
+        timestamp, level, fmt, args = record
+        try:
+            message = fmt % args if args else str(fmt)
+        except Exception:
+            # A bad format or wrong arguments must not lose the record (or stop the writer)
+            message = f"{fmt!r} % {args!r}"
+        level_name = LEVEL_NAMES.get(level, str(level))
+        if self.structured:
+            return json.dumps({"time": timestamp, "level": level_name, "message": message})
+        return f"Log: [{level_name}] {message}"
+
+    def start_async(self, **options):
+        """
+        Switch to production mode: log only queues messages and an
+        AsyncLogWriter (configured by options) writes them in batches.
+        Pending messages are written at interpreter exit or on shutdown().
+        """
+        with Logger._lock:
+            previous = Logger._writer
+            Logger._writer = AsyncLogWriter(formatter=self.format_record, **options)
+        if previous is not None:
+            previous.close()
+        else:
+            atexit.register(self.shutdown)
+
+    def shutdown(self):
+        """
+        Leave async mode, writing every queued message first.
+        """
+        with Logger._lock:
+            writer = Logger._writer
+            Logger._writer = None
+        if writer is not None:
+            writer.close()
 
 
 class Example:
@@ -53,5 +285,17 @@ if __name__ == "__main__":
 
     logger1.log("This is a singleton logger.")  # Logs a message using the singleton instance
 
+    # Levels: the format string is only filled in when the level is enabled
+    logger1.log(WARNING, "%d items left in stock", 3)
+    logger1.debug("Not shown at the default INFO level: %s", logger1)
+
+    # Production mode: messages are queued and written in batches by a background thread
+    logger1.start_async(batch_size=100, flush_interval=0.1)
+    logger1.configure(structured=True)  # One JSON object per line
+    for number in range(3):
+        logger2.info("Queued message %d", number)
+    logger1.shutdown()  # Writes everything still queued
+    logger1.configure(structured=False)
+
     # Creating an instance of Example
     ex = Example(10, 20, key="value")
\ No newline at end of file
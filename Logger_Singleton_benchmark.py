@@ -0,0 +1,202 @@
+"""
+Benchmarks for the Logger in Logger_Singleton.py.
+
+Run it directly:
+    python Logger_Singleton_benchmark.py
+
+Measures how long a caller waits inside each log call, comparing the
+synchronous print with the async mode that only queues the message. Output
+goes to os.devnull, so the numbers show caller-side cost, not terminal speed.
+It also checks that Logger() hands every thread the same instance, that a
+call with a bad format string neither loses the record nor stops the async
+writer, and that records arriving while or after the writer closes are
+neither lost nor raised into the caller.
+
+The disabled-call benchmark measures log calls below the configured level:
+an eager f-string pays for formatting anyway, while log(level, fmt, *args)
+and the level shortcuts return before formatting anything.
+"""
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+
+from Logger_Singleton import DEBUG, INFO, AsyncLogWriter, Logger
+
+
+def _latencies(logger, calls):
+    # Time every call separately, in nanoseconds
+    clock = time.perf_counter_ns
+    samples = []
+    for number in range(calls):
+        start = clock()
+        logger.log(f"message number {number}")
+        samples.append(clock() - start)
+    samples.sort()
+    return samples
+
+
+def _report(name, samples):
+    def percentile(fraction):
+        return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+    print(f"  {name:6s} p50 {percentile(0.50):6d} ns  p99 {percentile(0.99):7d} ns  max {samples[-1]:9d} ns")
+
+
+def benchmark_log_latency(calls=200_000):
+    """
+    Prints the per-call latency of log in sync and async mode.
+    """
+    logger = Logger()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        sync_samples = _latencies(logger, calls)
+    _report("sync", sync_samples)
+
+    logger.start_async(path=os.devnull, batch_size=1024, flush_interval=0.05)
+    async_samples = _latencies(logger, calls)
+    start = time.perf_counter()
+    logger.shutdown()
+    _report("async", async_samples)
+    print(f"  shutdown flush took {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+class _Expensive:
+    # Stands in for an object whose string form is costly to build
+    def __str__(self):
+        return ", ".join(str(number) for number in range(50))
+
+
+def benchmark_disabled_calls(calls=1_000_000):
+    """
+    Prints the average cost of a DEBUG call while the level is INFO.
+    """
+    logger = Logger()
+    logger.configure(level=INFO)
+    payload = _Expensive()
+    clock = time.perf_counter
+    results = {}
+
+    start = clock()
+    for _ in range(calls):
+        message = f"state: {payload}"  # What callers paid before: formatting up front
+    results["eager f-string"] = clock() - start
+
+    start = clock()
+    for _ in range(calls):
+        logger.log(DEBUG, "state: %s", payload)
+    results["log(DEBUG, fmt, arg)"] = clock() - start
+
+    start = clock()
+    for _ in range(calls):
+        logger.debug("state: %s", payload)
+    results["debug(fmt, arg)"] = clock() - start
+
+    for name, seconds in results.items():
+        print(f"  {name:22s} {seconds / calls * 1e9:7.1f} ns per call")
+
+
+class _SlowLookup(type):
+    # Makes reading _instance slow, so every thread that checks it without the
+    # lock sees None before the first one has stored its instance
+    _instances = {}
+
+    @property
+    def _instance(cls):
+        instance = _SlowLookup._instances.get(cls)
+        time.sleep(0.01)
+        return instance
+
+    @_instance.setter
+    def _instance(cls, instance):
+        _SlowLookup._instances[cls] = instance
+
+
+class _RacyLogger(Logger, metaclass=_SlowLookup):
+    pass
+
+
+def check_singleton_threads(threads=64):
+    """
+    Creates the Logger from many threads at once and checks they all get one
+    instance. The threads race through a Logger subclass whose _instance
+    lookup is slowed down, which reliably breaks a __new__ without the lock.
+    """
+    barrier = threading.Barrier(threads)
+    instances = []
+
+    def create():
+        barrier.wait()
+        instances.append(_RacyLogger())
+
+    workers = [threading.Thread(target=create) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert len({id(instance) for instance in instances}) == 1, "more than one Logger was created"
+    print(f"  {threads} threads got the same Logger instance")
+
+
+def check_bad_records(calls=1_000):
+    """
+    Logs a call whose arguments do not match its format in async mode and
+    checks that it and every later message are still written.
+    """
+    logger = Logger()
+    output = io.StringIO()
+    logger.start_async(stream=output, max_queue=100, flush_interval=0.01)
+    logger.info("bad %d %d", 1)  # One argument short
+    for number in range(calls):
+        logger.info("message %d", number)
+    logger.shutdown()
+    lines = output.getvalue().splitlines()
+    assert lines[0] == "Log: [INFO] 'bad %d %d' % (1,)", lines[0]
+    assert len(lines) == calls + 1, f"{len(lines)} lines written"
+    print(f"  a bad record was written as {lines[0]!r} and the writer kept going")
+
+
+def check_late_records(threads=8, calls=20_000):
+    """
+    Closes a file-backed writer while threads are still submitting, then
+    submits once more, and checks that every record was written to the file
+    or (after close) to stderr, and that no caller saw an exception.
+    """
+    logger = Logger()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "app.log")
+        writer = AsyncLogWriter(path=path, formatter=logger.format_record, flush_interval=0.001)
+        late_output = io.StringIO()
+        failures = []
+
+        def submit():
+            try:
+                for number in range(calls):
+                    writer.submit((0.0, INFO, "message %d", (number,)))
+            except Exception as error:
+                failures.append(error)
+
+        with contextlib.redirect_stderr(late_output):
+            workers = [threading.Thread(target=submit) for _ in range(threads)]
+            for worker in workers:
+                worker.start()
+            time.sleep(0.01)
+            writer.close()
+            for worker in workers:
+                worker.join()
+            writer.submit((0.0, INFO, "after close", ()))
+        with open(path, encoding="utf-8") as log_file:
+            written = sum(1 for _ in log_file)
+    late = late_output.getvalue().count("\n")
+    assert not failures, failures
+    assert late >= 1 and writer.late >= 1, (late, writer.late)
+    assert written + late == threads * calls + 1, f"{threads * calls + 1 - written - late} records lost"
+    print(f"  {written} records written before close, {late} late ones went to stderr, none lost")
+
+
+if __name__ == "__main__":
+    check_singleton_threads()
+    check_bad_records()
+    check_late_records()
+    benchmark_log_latency()
+    benchmark_disabled_calls()
@@ -1,25 +1,435 @@
+import http.client
+import json
+import random
+import smtplib
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.message import EmailMessage
 
 class NotificationStrategy(ABC):
     @abstractmethod
     def send(self, user, message):
         pass
 
-class EmailNotificationStrategy(NotificationStrategy):
-    def send(self, user, message):
-        print(f"Sending email to {user.email}: {message}")
+    def send_batch(self, users, message):
+        """
+        Send the same message to many users.
+        Returns one entry per user, in order: None if it was delivered, or the
+        exception that stopped it. This default sends to each user in turn;
+        strategies whose gateway accepts batches override it.
+        """
+        results = []
+        for user in users:
+            try:
+                self.send(user, message)
+                results.append(None)
+            except Exception as error:
+                results.append(error)
+        return results
+
+class GatewayNotificationStrategy(NotificationStrategy):
+    """
+    Base for the built-in channels. Without a transport, sending only prints
+    what would be sent. With one (see GatewayTransport), notifications go to
+    the remote gateway, and send_batch delivers a whole batch in one call.
+    """
+    address_attribute = None  # Name of the User attribute holding this channel's address
+
+    def __init__(self, transport=None):
+        self.transport = transport
+
+    @abstractmethod
+    def describe(self, address, message):
+        # The line printed instead of sending when there is no transport
+        pass
 
-class SMSNotificationStrategy(NotificationStrategy):
     def send(self, user, message):
-        print(f"Sending SMS to {user.phone_number}: {message}")
+        address = getattr(user, self.address_attribute)
+        if self.transport is None:
+            print(self.describe(address, message))
+            return
+        error = self.transport.deliver([address], message)[0]
+        if error is not None:
+            raise error
+
+    def send_batch(self, users, message):
+        if self.transport is None:
+            return super().send_batch(users, message)
+        return self.transport.deliver([getattr(user, self.address_attribute) for user in users], message)
+
+class EmailNotificationStrategy(GatewayNotificationStrategy):
+    address_attribute = "email"
+
+    def describe(self, address, message):
+        return f"Sending email to {address}: {message}"
+
+class SMSNotificationStrategy(GatewayNotificationStrategy):
+    address_attribute = "phone_number"
+
+    def describe(self, address, message):
+        return f"Sending SMS to {address}: {message}"
+
+class PushNotificationStrategy(GatewayNotificationStrategy):
+    address_attribute = "device_id"
+
+    def describe(self, address, message):
+        return f"Sending push notification to {address}: {message}"
+
+class TransientDeliveryError(Exception):
+    """
+    A delivery failure worth retrying: a dropped connection, a rate limit
+    answer or a temporary server error.
+    """
+
+class ConnectionPool:
+    """
+    Keeps up to max_size open connections and lends them out, so each
+    delivery reuses a connection instead of setting up a new one.
+    connect() opens a connection; close(connection) closes one.
+    """
+    def __init__(self, connect, close, max_size=4):
+        self._connect = connect
+        self._close = close
+        self.max_size = max_size
+        self.opened = 0  # Connections opened over the pool's lifetime
+        self._idle = deque()
+        self._in_use = 0
+        self._available = threading.Condition()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection. It goes back to the pool afterwards, unless the
+        block raised, in which case it is closed and discarded.
+        """
+        with self._available:
+            while not self._idle and self._in_use >= self.max_size:
+                self._available.wait()
+            connection = self._idle.pop() if self._idle else None
+            self._in_use += 1
+        try:
+            if connection is None:
+                connection = self._connect()
+                self.opened += 1
+            yield connection
+        except BaseException:
+            if connection is not None:
+                self._discard(connection)
+            with self._available:
+                self._in_use -= 1
+                self._available.notify()
+            raise
+        with self._available:
+            self._idle.append(connection)
+            self._in_use -= 1
+            self._available.notify()
+
+    def _discard(self, connection):
+        try:
+            self._close(connection)
+        except Exception:
+            pass  # It is being thrown away because it is broken already
+
+    def close(self):
+        with self._available:
+            while self._idle:
+                self._discard(self._idle.pop())
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter: rate tokens per second, with
+    bursts of up to capacity. acquire() waits until a token is available.
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+class RetryPolicy:
+    """
+    Retries with "full jitter" exponential backoff: before retry n the caller
+    sleeps a random time between 0 and min(max_delay, base_delay * 2**n),
+    which keeps many senders from retrying in lockstep.
+    retry_on lists the exception types worth retrying; OSError covers
+    refused, reset and timed-out connections.
+    """
+    def __init__(self, max_attempts=3, base_delay=0.05, max_delay=2.0, retry_on=(TransientDeliveryError, OSError)):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+
+    def backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+class GatewayTransport(ABC):
+    """
+    Shared delivery machinery for remote gateways: pooled connections,
+    a per-channel token bucket (rate messages per second, when given) and
+    jittered retries of transient failures. Subclasses only say how to open
+    and close a connection and how to send one message over it.
+
+    send_one raises when the connection itself failed, so it is dropped from
+    the pool, and returns an exception when the gateway rejected the message
+    but the connection is still usable. Either way, transient() decides
+    whether the failure is retried. Every attempt, retries included, takes
+    a token from the rate limiter.
+    """
+    def __init__(self, max_connections=4, rate=None, burst=None, retry=None):
+        self.pool = ConnectionPool(self.connect, self.disconnect, max_connections)
+        self.rate_limiter = TokenBucket(rate, burst) if rate else None
+        self.retry = retry or RetryPolicy()
+
+    @abstractmethod
+    def connect(self):
+        pass
+
+    def disconnect(self, connection):
+        connection.close()
+
+    @abstractmethod
+    def send_one(self, connection, address, message):
+        pass
+
+    def transient(self, error):
+        """
+        Whether a failed attempt is worth retrying.
+        """
+        return isinstance(error, self.retry.retry_on)
+
+    def deliver(self, addresses, message):
+        """
+        Send message to every address.
+        Returns None or the final exception for each address, in order.
+        """
+        return [self._deliver_one(address, message) for address in addresses]
+
+    def _deliver_one(self, address, message):
+        for attempt in range(self.retry.max_attempts):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                with self.pool.connection() as connection:
+                    error = self.send_one(connection, address, message)
+            except Exception as failure:
+                error = failure
+            if error is None:
+                return None
+            if not self.transient(error) or attempt + 1 == self.retry.max_attempts:
+                return error  # Permanent failure, or out of attempts
+            time.sleep(self.retry.backoff(attempt))
+
+    def close(self):
+        self.pool.close()
+
+class SMTPTransport(GatewayTransport):
+    """
+    Sends email through an SMTP server, keeping sessions open between messages.
+    """
+    def __init__(self, host, port=25, sender="noreply@example.com", subject="Notification", timeout=10, **options):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.subject = subject
+        self.timeout = timeout
+        super().__init__(**options)
+
+    def connect(self):
+        return smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+
+    def disconnect(self, connection):
+        try:
+            connection.quit()
+        finally:
+            connection.close()
+
+    def transient(self, error):
+        # smtplib's exceptions are OSErrors, but only a dropped connection or
+        # a 4xx reply is temporary; any other SMTP error is final
+        if isinstance(error, smtplib.SMTPServerDisconnected):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException):
+            return 400 <= error.smtp_code < 500
+        if isinstance(error, smtplib.SMTPException):
+            return False
+        return super().transient(error)
+
+    def send_one(self, connection, address, message):
+        email = EmailMessage()
+        email["From"] = self.sender
+        email["To"] = address
+        email["Subject"] = self.subject
+        email.set_content(message)
+        try:
+            connection.send_message(email)
+        except smtplib.SMTPServerDisconnected as error:
+            raise TransientDeliveryError(str(error)) from error
+        except smtplib.SMTPRecipientsRefused as error:
+            if all(400 <= code < 500 for code, _ in error.recipients.values()):
+                return TransientDeliveryError(str(error))
+            return error
+        except smtplib.SMTPResponseException as error:
+            if 400 <= error.smtp_code < 500:  # SMTP 4xx replies are temporary
+                return TransientDeliveryError(str(error))
+            return error
+        return None
+
+class HTTPTransport(GatewayTransport):
+    """
+    Posts {"to": address, "message": message} as JSON to an HTTP gateway
+    (SMS or push providers) over persistent keep-alive connections.
+    429 and 5xx answers are retried; other 4xx answers are not.
+    """
+    def __init__(self, host, port=80, path="/send", timeout=10, **options):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.timeout = timeout
+        super().__init__(**options)
+
+    def connect(self):
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def send_one(self, connection, address, message):
+        body = json.dumps({"to": address, "message": message})
+        try:
+            connection.request("POST", self.path, body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()  # Drain the body so the connection can be reused
+        except (http.client.HTTPException, ConnectionError) as error:
+            raise TransientDeliveryError(str(error)) from error
+        if response.status == 429 or response.status >= 500:
+            return TransientDeliveryError(f"gateway answered {response.status}")
+        if response.status >= 400:
+            return ValueError(f"gateway rejected the notification: {response.status}")
+        return None
+
+class StubTransport:
+    """
+    Offline stand-in for a notification gateway, for tests and benchmarks.
+    Each delivery call sleeps for a fixed round-trip latency plus a small
+    per-recipient cost, and can fail a fraction of recipients at random.
+    """
+    def __init__(self, latency=0.002, per_recipient=0.00001, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.per_recipient = per_recipient
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.delivered = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def deliver(self, addresses, message):
+        # Returns None or a ConnectionError for each address
+        time.sleep(self.latency + self.per_recipient * len(addresses))
+        with self._lock:
+            self.calls += 1
+            results = [ConnectionError("stub delivery failed") if self._random.random() < self.failure_rate else None
+                       for _ in addresses]
+            self.delivered += results.count(None)
+        return results
+
+
+class StubNotificationStrategy(NotificationStrategy):
+    """
+    Strategy that sends through a StubTransport. With batched=False it only
+    implements send, so send_bulk falls back to one call per user.
+    """
+    def __init__(self, transport, address_attribute="email", batched=True):
+        self.transport = transport
+        self.address_attribute = address_attribute
+        self.batched = batched
 
-class PushNotificationStrategy(NotificationStrategy):
     def send(self, user, message):
-        print(f"Sending push notification to {user.device_id}: {message}")
+        error = self.transport.deliver([getattr(user, self.address_attribute)], message)[0]
+        if error is not None:
+            raise error
 
-class NotificationManager:
+    def send_batch(self, users, message):
+        if not self.batched:
+            return super().send_batch(users, message)
+        return self.transport.deliver([getattr(user, self.address_attribute) for user in users], message)
+
+
+class ChannelMetrics:
+    """
+    Latency and throughput of one notification channel.
+    """
     def __init__(self):
+        self.calls = 0  # Strategy calls (one per send_notification, one per batch)
+        self.notifications = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.first_started = None
+        self.last_finished = None
+        self._lock = threading.Lock()
+
+    def record(self, started, finished, notifications, failures):
+        latency = finished - started
+        with self._lock:
+            self.calls += 1
+            self.notifications += notifications
+            self.failures += failures
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if self.first_started is None or started < self.first_started:
+                self.first_started = started
+            if self.last_finished is None or finished > self.last_finished:
+                self.last_finished = finished
+
+    def summary(self):
+        elapsed = (self.last_finished - self.first_started) if self.calls else 0.0
+        return {
+            "notifications": self.notifications,
+            "failures": self.failures,
+            "mean_latency": self.total_latency / self.calls if self.calls else 0.0,
+            "max_latency": self.max_latency,
+            "throughput": self.notifications / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+class DeliveryResult:
+    """
+    Outcome of sending one notification to one user.
+    """
+    __slots__ = ("user", "notification_type", "error")
+
+    def __init__(self, user, notification_type, error=None):
+        self.user = user
+        self.notification_type = notification_type
+        self.error = error  # None when the notification was delivered
+
+    @property
+    def delivered(self):
+        return self.error is None
+
+
+class NotificationManager:
+    def __init__(self, max_workers=8, batch_size=500):
         self._strategies = {}
+        self.max_workers = max_workers  # Concurrent send_batch calls in send_bulk
+        self.batch_size = batch_size  # Users per send_batch call in send_bulk
+        self._metrics = {}  # notification type -> ChannelMetrics
+        self._metrics_lock = threading.Lock()
 
     def register_strategy(self, notification_type, strategy):
         self._strategies[notification_type] = strategy
@@ -27,10 +437,78 @@ class NotificationManager:
     def send_notification(self, user, notification_type, message):
         strategy = self._strategies.get(notification_type)
         if strategy:
-            strategy.send(user, message)
+            started = time.perf_counter()
+            try:
+                strategy.send(user, message)
+            except Exception:
+                self._channel_metrics(notification_type).record(started, time.perf_counter(), 1, 1)
+                raise
+            self._channel_metrics(notification_type).record(started, time.perf_counter(), 1, 0)
         else:
             raise ValueError(f"No strategy registered for type {notification_type}")
 
+    def send_bulk(self, users, notification_type, message):
+        """
+        Send message to many users at once.
+        notification_type is a registered type, or a function that picks the
+        type for each user. Recipients are grouped per strategy, cut into
+        batches of batch_size and handed to the strategy's send_batch on a
+        pool of max_workers threads.
+        Returns one DeliveryResult per user, in the order of users.
+        """
+        users = list(users)
+        pick_type = notification_type if callable(notification_type) else (lambda user: notification_type)
+        groups = {}  # notification type -> positions of its users
+        for position, user in enumerate(users):
+            groups.setdefault(pick_type(user), []).append(position)
+        for group_type in groups:
+            if group_type not in self._strategies:
+                raise ValueError(f"No strategy registered for type {group_type}")
+
+        results = [None] * len(users)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            batches = []
+            for group_type, positions in groups.items():
+                strategy = self._strategies[group_type]
+                for start in range(0, len(positions), self.batch_size):
+                    batch = positions[start:start + self.batch_size]
+                    future = executor.submit(self._send_batch, group_type, strategy,
+                                             [users[position] for position in batch], message)
+                    batches.append((group_type, batch, future))
+            for group_type, batch, future in batches:
+                try:
+                    errors = future.result()
+                except Exception as error:  # The whole batch failed
+                    errors = [error] * len(batch)
+                for position, error in zip(batch, errors):
+                    results[position] = DeliveryResult(users[position], group_type, error)
+        return results
+
+    def _send_batch(self, notification_type, strategy, users, message):
+        # Runs on a pool thread: send one batch and record its latency
+        started = time.perf_counter()
+        try:
+            errors = strategy.send_batch(users, message)
+        except Exception:
+            self._channel_metrics(notification_type).record(started, time.perf_counter(), len(users), len(users))
+            raise
+        failures = sum(error is not None for error in errors)
+        self._channel_metrics(notification_type).record(started, time.perf_counter(), len(users), failures)
+        return errors
+
+    def _channel_metrics(self, notification_type):
+        metrics = self._metrics.get(notification_type)
+        if metrics is None:
+            with self._metrics_lock:
+                metrics = self._metrics.setdefault(notification_type, ChannelMetrics())
+        return metrics
+
+    def metrics(self):
+        """
+        Returns latency and throughput figures for every channel used so far.
+        """
+        return {notification_type: metrics.summary() for notification_type, metrics in self._metrics.items()}
+
 
 class User:
     def __init__(self, email, phone_number, device_id):
@@ -57,3 +535,10 @@ if __name__ == "__main__":
     manager.send_notification(user1, "email", "Hello via Email!")
     manager.send_notification(user1, "sms", "Hello via SMS!")
     manager.send_notification(user1, "push", "Hello via Push Notification!")
+
+    # Campaign to many users: batched and concurrent, with one result per recipient
+    users = [User(f"user{n}@example.com", f"555{n:07d}", f"device{n}") for n in range(10_000)]
+    manager.register_strategy("stub", StubNotificationStrategy(StubTransport(failure_rate=0.01, seed=1)))
+    results = manager.send_bulk(users, "stub", "Big sale today!")
+    print(f"Delivered {sum(result.delivered for result in results)} of {len(results)} notifications")
+    print("Channel metrics:", manager.metrics())
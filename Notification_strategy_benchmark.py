@@ -0,0 +1,238 @@
+"""
+Benchmarks for NotificationManager in Notification_strategy.py.
+
+Run it directly:
+    python Notification_strategy_benchmark.py
+
+Sends one campaign through a StubTransport (a fixed round-trip latency per
+gateway call, no network) in three ways: a serial send_notification loop,
+send_bulk with a strategy that only implements send (per-user fallback, but
+concurrent), and send_bulk with a batch-capable strategy.
+
+It then sends real traffic through SMTPTransport and HTTPTransport to small
+fake servers on localhost. The servers count the connections they accept,
+and the run asserts that the pooled transports reuse connections and that
+every message arrives; the HTTP server
+can also answer 503 to a fraction of requests to exercise the retries.
+A separate check has the SMTP server reject recipients and asserts that
+5xx replies are given up on at once while 4xx replies are retried.
+"""
+import http.server
+import random
+import socketserver
+import threading
+import time
+
+from Notification_strategy import (EmailNotificationStrategy, HTTPTransport, NotificationManager, RetryPolicy,
+                                   SMSNotificationStrategy, SMTPTransport, StubNotificationStrategy,
+                                   StubTransport, User)
+
+
+def benchmark_send_bulk(recipients=20_000, latency=0.002, max_workers=16, batch_size=500):
+    users = [User(f"user{n}@example.com", f"555{n:07d}", f"device{n}") for n in range(recipients)]
+    manager = NotificationManager(max_workers=max_workers, batch_size=batch_size)
+    manager.register_strategy("per_user", StubNotificationStrategy(StubTransport(latency), batched=False))
+    manager.register_strategy("batched", StubNotificationStrategy(StubTransport(latency), batched=True))
+
+    # The serial loop is timed on a slice and scaled, it would take too long otherwise
+    sample = users[:500]
+    start = time.perf_counter()
+    for user in sample:
+        manager.send_notification(user, "per_user", "Hello!")
+    serial_rate = len(sample) / (time.perf_counter() - start)
+    print(f"  serial send_notification      {serial_rate:12,.0f} notifications/s")
+
+    for notification_type in ("per_user", "batched"):
+        start = time.perf_counter()
+        results = manager.send_bulk(users, notification_type, "Hello!")
+        seconds = time.perf_counter() - start
+        assert all(result.delivered for result in results)
+        label = f"send_bulk ({notification_type})"
+        print(f"  {label:30s}{recipients / seconds:12,.0f} notifications/s")
+
+
+class _Counters:
+    # Thread-safe event counters for the fake servers, which handle each connection on its own thread
+    def _reset_counters(self):
+        self._counter_lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        self.failures = 0  # Requests answered with an error on purpose
+
+    def count(self, counter):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    # Just enough of SMTP for smtplib: greet, accept every sender, recipient and
+    # message, except the recipients the server was told to reject
+    def handle(self):
+        self.server.count("connections")
+        self._reply("220 localhost fake SMTP")
+        recipient = None
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in (b"EHLO", b"HELO"):
+                self._reply("250 localhost")
+            elif command == b"RCPT":
+                recipient = line.decode().partition("<")[2].partition(">")[0]
+                self._answer(b"RCPT", recipient, "250 ok")
+            elif command == b"DATA":
+                self._reply("354 end data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                if self._answer(b"DATA", recipient, "250 queued"):
+                    self.server.count("messages")
+            elif command == b"QUIT":
+                self._reply("221 bye")
+                return
+            else:  # MAIL, RSET, NOOP
+                self._reply("250 ok")
+
+    def _answer(self, command, recipient, accepted):
+        # Replies with the rejection configured for recipient at this command, or accepted
+        rejection = self.server.rejected.get(recipient)
+        if rejection is not None and rejection[0] == command:
+            self.server.count("failures")
+            self._reply(f"{rejection[1]} rejected")
+            return False
+        self._reply(accepted)
+        return True
+
+    def _reply(self, text):
+        self.wfile.write(text.encode() + b"\r\n")
+
+
+class FakeSMTPServer(_Counters, socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, rejected=None):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.rejected = rejected or {}  # address -> (b"RCPT" or b"DATA", reply code)
+        self._reset_counters()
+
+
+class _HTTPHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections open between requests
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        if self.server.random.random() < self.server.failure_rate:
+            status = 503
+            self.server.count("failures")
+        else:
+            status = 200
+            self.server.count("messages")
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeHTTPServer(_Counters, http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, failure_rate=0.0, seed=0):
+        super().__init__(("127.0.0.1", 0), _HTTPHandler)
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self._reset_counters()
+
+
+def _serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark_gateways(recipients=2_000, max_workers=8, batch_size=100, failure_rate=0.05):
+    """
+    Sends a campaign over SMTP and HTTP to local fake servers and prints the
+    manager's channel metrics and how many connections each server saw.
+    Asserts that every message arrived over at most max_workers connections
+    per server, that the HTTP server's 503 answers were retried, and that
+    the rate-limited channel kept to its rate.
+    """
+    users = [User(f"user{n}@example.com", f"555{n:07d}", f"device{n}") for n in range(recipients)]
+    smtp_server = _serve(FakeSMTPServer())
+    http_server = _serve(FakeHTTPServer(failure_rate))
+    smtp = SMTPTransport(*smtp_server.server_address, max_connections=max_workers)
+    retry = RetryPolicy(max_attempts=5, base_delay=0.001, max_delay=0.02)
+    sms = HTTPTransport(*http_server.server_address, max_connections=max_workers, retry=retry)
+
+    manager = NotificationManager(max_workers=max_workers, batch_size=batch_size)
+    manager.register_strategy("email", EmailNotificationStrategy(smtp))
+    manager.register_strategy("sms", SMSNotificationStrategy(sms))
+    for notification_type, server in (("email", smtp_server), ("sms", http_server)):
+        results = manager.send_bulk(users, notification_type, "Hello!")
+        delivered = sum(result.delivered for result in results)
+        assert delivered == recipients, f"{notification_type}: only {delivered} of {recipients} delivered"
+        assert server.messages == recipients, f"{notification_type}: server received {server.messages} messages"
+        assert server.connections <= max_workers, \
+            f"{notification_type}: {server.connections} connections for a pool of {max_workers}"
+        metrics = manager.metrics()[notification_type]
+        print(f"  {notification_type:5s} delivered {delivered}/{recipients} over {server.connections} connections, "
+              f"{metrics['throughput']:8,.0f} notifications/s, "
+              f"mean batch latency {metrics['mean_latency'] * 1000:.1f} ms")
+    # Every 503 was answered to a request that was then retried until delivered
+    assert failure_rate == 0 or http_server.failures > 0, "the HTTP server never failed a request"
+    print(f"  sms   retried {http_server.failures} requests answered with 503")
+
+    # The rate limiter caps one channel regardless of how many threads send
+    limited = HTTPTransport(*http_server.server_address, max_connections=max_workers, rate=500, burst=50,
+                            retry=retry)
+    manager.register_strategy("limited_sms", SMSNotificationStrategy(limited))
+    requests_before = http_server.messages + http_server.failures
+    start = time.perf_counter()
+    results = manager.send_bulk(users[:1_000], "limited_sms", "Hello!")
+    seconds = time.perf_counter() - start
+    requests = http_server.messages + http_server.failures - requests_before
+    assert all(result.delivered for result in results)
+    # Retries take tokens as well, so all requests, not just the messages, keep to the rate
+    assert requests <= 50 + 500 * seconds * 1.05, f"rate limit exceeded: {requests} requests in {seconds:.2f}s"
+    print(f"  sms limited to 500/s sent 1000 ({requests} requests) in {seconds:.2f}s")
+
+    for transport in (smtp, sms, limited):
+        transport.close()
+    smtp_server.shutdown()
+    http_server.shutdown()
+
+
+def check_smtp_rejections(max_attempts=4):
+    """
+    Sends to recipients the fake SMTP server rejects and asserts how often
+    each was attempted: once for permanent 5xx replies, max_attempts times
+    for temporary 4xx replies.
+    """
+    rejected = {"unknown@example.com": (b"RCPT", 550), "spam@example.com": (b"DATA", 554),
+                "busy@example.com": (b"RCPT", 451), "later@example.com": (b"DATA", 452)}
+    attempts = {"unknown@example.com": 1, "spam@example.com": 1, "busy@example.com": max_attempts,
+                "later@example.com": max_attempts, "user@example.com": 1}
+    retry = RetryPolicy(max_attempts=max_attempts, base_delay=0.001, max_delay=0.01)
+    for address, expected in attempts.items():
+        server = _serve(FakeSMTPServer(rejected))
+        transport = SMTPTransport(*server.server_address, max_connections=1, retry=retry)
+        error = transport.deliver([address], "Hello!")[0]
+        transport.close()
+        server.shutdown()
+        assert (error is None) == (address not in rejected), f"{address}: {error!r}"
+        made = server.failures + server.messages
+        assert made == expected, f"{address}: {made} attempts, expected {expected}"
+        assert server.connections == 1, f"{address}: a rejection dropped the connection"
+    print(f"  SMTP 5xx rejections tried once, 4xx retried {max_attempts} times")
+
+
+if __name__ == "__main__":
+    check_smtp_rejections()
+    benchmark_send_bulk()
+    benchmark_gateways()
@@ -48,6 +48,7 @@ class Board:
         self.size = size  # Stores the size of the board
         self.snakes = {}  # Dict to store the snake positions: {head: tail}
         self.ladders = {}  # Dict to store ladder positions: {bottom: top}
+        self.jump_table = None  # Flat list built by finalize(): jump_table[cell] = where a player ends up
 
     def add_snake(self, start, end):
         """
@@ -56,6 +57,7 @@ class Board:
         :param end: The position of the snake's tail (where the snake ends).
         """
         self.snakes[start] = end
+        self.jump_table = None  # The layout changed, so a compiled table is stale
 
     def add_ladder(self, start, end):
         """
@@ -64,6 +66,24 @@ class Board:
         :param end: The position of the ladder's top (where the ladder ends).
         """
         self.ladders[start] = end
+        self.jump_table = None  # The layout changed, so a compiled table is stale
+
+    def finalize(self):
+        """
+        Compile the snakes and ladders into a flat jump table.
+        Every cell maps to itself unless a ladder or snake starts there; a snake
+        wins over a ladder on the same cell, as in get_new_position. Adding a
+        snake or ladder afterwards discards the table until the next finalize.
+        :return: The board, so the call can be chained.
+        """
+        length = max([self.size, *self.snakes, *self.ladders]) + 1
+        jumps = list(range(length))
+        for start, end in self.ladders.items():
+            jumps[start] = end
+        for start, end in self.snakes.items():
+            jumps[start] = end
+        self.jump_table = jumps
+        return self
 
     def get_new_position(self, position):
         """
@@ -71,6 +91,9 @@ class Board:
         :param position: The current position of the player.
         :return: The new position after considering snakes and ladders.
         """
+        jumps = self.jump_table
+        if jumps is not None:  # Finalized board: one list lookup
+            return jumps[position] if position < len(jumps) else position
         if position in self.snakes:  # Check if the current position is in snake's head.
             return self.snakes[position]  # Move the player to the snake's tail
         elif position in self.ladders:  # Check if the current position is at the bottom of the ladder
@@ -95,34 +118,262 @@ class Player:
         self.position += steps
 
 
+import hashlib
+import itertools
 import random
+from abc import ABC, abstractmethod
 
+try:
+    import numpy as np  # Optional: faster block generation of dice rolls
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
 
-class Dice:
+
+def derive_seed(*keys):
     """
-    Handles dice rolling.
+    Derive a reproducible 64-bit seed from any mix of hashable keys,
+    for example derive_seed(base_seed, game_index) for each game of a parallel
+    run. The same keys always give the same seed, in any process.
     """
+    digest = hashlib.blake2b(repr(keys).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class DiceStrategy(ABC):
+    """
+    Strategy interface for dice.
+    Rolls are generated in blocks of block_size (with a NumPy Generator when
+    numpy is installed, otherwise with random.Random) and handed out one at a
+    time from a buffer, so roll() is usually just one iterator step.
+    Dice with the same seed produce the same rolls.
+    """
+    def __init__(self, seed=None, block_size=1024):
+        """
+        :param seed: Seed for this dice's own random generator.
+        :param block_size: Number of rolls generated at a time.
+        """
+        self.seed = seed
+        self.block_size = block_size
+        self.rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+        self._buffer = iter(())
+
+    @abstractmethod
+    def generate(self, count):
+        """
+        Generate count rolls.
+        :return: A list of roll results.
+        """
+        pass
+
+    @abstractmethod
+    def distribution(self):
+        """
+        :return: Dict mapping every possible roll to its probability.
+        """
+        pass
+
     def roll(self):
         """
-        Roll the dice to generate a random number between 1 and 6.
-        :return: The result of the dice roll.
+        Roll the dice.
+        :return: The next roll from the buffer, refilling it when empty.
         """
-        return random.randint(1, 6)
+        try:
+            return next(self._buffer)
+        except StopIteration:
+            self._buffer = iter(self.generate(self.block_size))
+            return next(self._buffer)
+
+    def rolls(self, count):
+        """
+        Roll the dice count times.
+        :return: A list of roll results, continuing the same sequence as roll().
+        """
+        results = list(itertools.islice(self._buffer, count))
+        if len(results) < count:
+            results.extend(self.generate(count - len(results)))
+        return results
+
+
+class Dice(DiceStrategy):
+    """
+    Handles dice rolling: one fair die, six-sided unless told otherwise.
+    """
+    def __init__(self, sides=6, seed=None, block_size=1024):
+        super().__init__(seed, block_size)
+        self.sides = sides
+
+    def generate(self, count):
+        if np is not None:
+            return self.rng.integers(1, self.sides + 1, size=count).tolist()
+        return self.rng.choices(range(1, self.sides + 1), k=count)
+
+    def distribution(self):
+        return {face: 1 / self.sides for face in range(1, self.sides + 1)}
+
+
+class WeightedDice(DiceStrategy):
+    """
+    A single die whose faces come up with the given relative weights.
+    """
+    def __init__(self, weights, seed=None, block_size=1024):
+        """
+        :param weights: Dict mapping each face to its relative weight.
+        """
+        super().__init__(seed, block_size)
+        total = sum(weights.values())
+        self.faces = sorted(weights)
+        self.probabilities = [weights[face] / total for face in self.faces]
+
+    def generate(self, count):
+        if np is not None:
+            return self.rng.choice(self.faces, size=count, p=self.probabilities).tolist()
+        return self.rng.choices(self.faces, weights=self.probabilities, k=count)
+
+    def distribution(self):
+        return dict(zip(self.faces, self.probabilities))
+
+
+class MultiDice(DiceStrategy):
+    """
+    Several fair dice rolled together; the roll is their sum.
+    """
+    def __init__(self, count=2, sides=6, seed=None, block_size=1024):
+        super().__init__(seed, block_size)
+        self.count = count
+        self.sides = sides
+
+    def generate(self, count):
+        if np is not None:
+            return self.rng.integers(1, self.sides + 1, size=(count, self.count)).sum(axis=1).tolist()
+        faces = range(1, self.sides + 1)
+        return [sum(self.rng.choices(faces, k=self.count)) for _ in range(count)]
+
+    def distribution(self):
+        # Convolve the single-die distribution count times
+        totals = {0: 1.0}
+        for _ in range(self.count):
+            next_totals = {}
+            for total, probability in totals.items():
+                for face in range(1, self.sides + 1):
+                    next_totals[total + face] = next_totals.get(total + face, 0.0) + probability / self.sides
+            totals = next_totals
+        return totals
+
+
+class GameEvent:
+    """
+    Something that happened during a turn, delivered to GameListeners.
+    Every turn emits ROLL, then SNAKE or LADDER if the player landed on one
+    (start is where they landed, end where it took them), then MOVE from the
+    position before the roll to where the player finally stands. A winning
+    turn ends with WIN.
+    """
+    ROLL = "roll"
+    MOVE = "move"
+    SNAKE = "snake"
+    LADDER = "ladder"
+    WIN = "win"
+
+    __slots__ = ("kind", "player", "roll", "start", "end")
+
+    def __init__(self, kind, player, roll, start, end):
+        self.kind = kind
+        self.player = player
+        self.roll = roll
+        self.start = start
+        self.end = end
+
+
+class GameListener(ABC):
+    """
+    Observer interface for game events.
+    """
+    @abstractmethod
+    def on_event(self, event):
+        pass
+
+    def on_events(self, events):
+        """
+        Receive a batch of events, in order. Override for cheaper bulk handling.
+        """
+        for event in events:
+            self.on_event(event)
+
+
+class ConsoleListener(GameListener):
+    """
+    Prints each move and the winner, the way the game always reported them.
+    """
+    def on_event(self, event):
+        if event.kind == GameEvent.MOVE:
+            print(f"{event.player.name} rolled a {event.roll} and moved to position {event.end}")
+        elif event.kind == GameEvent.WIN:
+            print(f"{event.player.name} has won the game!")
+
+
+class BufferedListener(GameListener):
+    """
+    Collects events and hands them to another listener in batches of
+    batch_size, and whenever a game is won. Call flush() to deliver the rest.
+    """
+    def __init__(self, listener, batch_size=256):
+        self.listener = listener
+        self.batch_size = batch_size
+        self.buffer = []
+
+    def on_event(self, event):
+        self.buffer.append(event)
+        if len(self.buffer) >= self.batch_size or event.kind == GameEvent.WIN:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            events, self.buffer = self.buffer, []
+            self.listener.on_events(events)
 
 
 class Game:
     """
     Manages the game flow and interactions between players.
+    Listeners registered with subscribe are told about every roll, move,
+    snake, ladder and win. With no listeners, a turn only pays for one
+    truth test of the listener list.
     """
-    def __init__(self, board, players):
+    def __init__(self, board, players, dice=None, seed=None):
         """
         Initialize the game with a board and a list of players.
         :param board: The game board.
         :param players: A list of players participating in the game.
+        :param dice: The DiceStrategy to roll; a standard Dice if not given.
+        :param seed: Seed for the standard Dice, to replay a game exactly.
         """
         self.board = board
         self.players = players
+        self.dice = dice if dice is not None else Dice(seed=seed)  # Created once, reused every turn
         self.current_player_index = 0  # Start with the first player
+        self.listeners = []  # GameListeners notified of every event
+
+    def subscribe(self, listener):
+        """
+        Register a GameListener.
+        """
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def _emit_turn(self, player, dice_roll, start, landed, end):
+        # Build the events of one turn and deliver them to every listener
+        events = [GameEvent(GameEvent.ROLL, player, dice_roll, start, landed)]
+        if end != landed:
+            kind = GameEvent.SNAKE if landed in self.board.snakes else GameEvent.LADDER
+            events.append(GameEvent(kind, player, dice_roll, landed, end))
+        events.append(GameEvent(GameEvent.MOVE, player, dice_roll, start, end))
+        if end >= self.board.size:
+            events.append(GameEvent(GameEvent.WIN, player, dice_roll, start, end))
+        for listener in self.listeners:
+            for event in events:
+                listener.on_event(event)
 
     def play_turn(self):
         """
@@ -130,21 +381,64 @@ class Game:
         :return: Boolean indicating if the game has ended with a winner.
         """
         player = self.players[self.current_player_index]
-        dice_roll = Dice().roll()
+        dice_roll = self.dice.roll()
+        start = player.position
         player.move(dice_roll)
-        new_position = self.board.get_new_position(player.position)
+        landed = player.position
+        new_position = self.board.get_new_position(landed)
         player.position = new_position
-        print(f"{player.name} rolled a {dice_roll} and moved to position {player.position}")
+        if self.listeners:
+            self._emit_turn(player, dice_roll, start, landed, new_position)
 
         # Check if the player has won
         if player.position >= self.board.size:
-            print(f"{player.name} has won the game!")
             return True
 
         # Move to the next player
         self.current_player_index = (self.current_player_index + 1) % len(self.players)
         return False
 
+    def play_fast(self, max_turns=None):
+        """
+        Play the game to the end without printing or emitting any events.
+        Uses the board's jump table (finalizing the board if needed) and keeps
+        positions in a local list, so a turn is one roll, one addition and one
+        list lookup. Player positions are written back when it returns.
+        :param max_turns: Stop after this many turns even without a winner.
+        :return: (winner, turns) where winner is None if max_turns ran out.
+        """
+        board = self.board
+        if board.jump_table is None:
+            board.finalize()
+        jumps = board.jump_table
+        limit = len(jumps)
+        size = board.size
+        roll = self.dice.roll
+        players = self.players
+        positions = [player.position for player in players]
+        count = len(positions)
+        index = self.current_player_index
+        turns = 0
+        winner = None
+
+        while max_turns is None or turns < max_turns:
+            position = positions[index] + roll()
+            if position < limit:
+                position = jumps[position]
+            positions[index] = position
+            turns += 1
+            if position >= size:
+                winner = players[index]
+                break
+            index += 1
+            if index == count:
+                index = 0
+
+        for player, position in zip(players, positions):
+            player.position = position
+        self.current_player_index = index
+        return winner, turns
+
 
 if __name__ == "__main__":
     """
@@ -155,8 +449,8 @@ if __name__ == "__main__":
     Game: Manages the flow of the game, including player turns, movement, and checking for a winner.
 
     Design Patterns:
-    Strategy Pattern could be applied if you want different dice rolling strategies.
-    Observer Pattern could be useful if you want to notify players of changes, like when a player lands on a snake or ladder.
+    Strategy Pattern is applied to dice: Dice, WeightedDice and MultiDice implement DiceStrategy.
+    Observer Pattern is applied to game events: GameListeners subscribe to rolls, moves, snakes, ladders and wins.
     Command Pattern could be applied to encapsulate player actions (like rolling the dice) and handle them uniformly.
   
     """
@@ -181,11 +475,23 @@ if __name__ == "__main__":
     player2 = Player("Player 2")
     player3 = Player("Player 3")
 
-    # Create a game with the board and players
+    # Create a game with the board and players, reporting moves on the console
     game = Game(board, [player1, player2, player3])
+    game.subscribe(ConsoleListener())
 
     # Play the game until there's a winner
     winner = False
     while not winner:
         winner = game.play_turn()
 
+    # Simulate a quiet game on the finalized board: only the result is reported
+    board.finalize()
+    quiet_game = Game(board, [Player("Player 1"), Player("Player 2"), Player("Player 3")])
+    winner, turns = quiet_game.play_fast()
+    print(f"Fast game: {winner.name} won after {turns} turns")
+
+    # Two six-sided dice, seeded so the game can be replayed exactly
+    seeded_game = Game(board, [Player("Player 1"), Player("Player 2")], dice=MultiDice(2, seed=derive_seed(7, 0)))
+    winner, turns = seeded_game.play_fast()
+    print(f"Two-dice game: {winner.name} won after {turns} turns")
+
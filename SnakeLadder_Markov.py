@@ -0,0 +1,208 @@
+"""
+Exact analysis of Snake and Ladder boards as a Markov chain.
+
+A single player's position is a Markov chain: from cell c, a roll r moves the
+player to board.get_new_position(c + r), and every cell at or beyond
+board.size is one absorbing "finished" state. Each cell has at most one
+successor per dice face, so the transition matrix is sparse and the chain is
+analysed with sparse operations only:
+
+- the distribution of turns to finish comes from repeatedly pushing the
+  probability vector through the transitions (one np.bincount per face);
+- the expected number of visits to each cell solves (I - Q)^T n = e_0, where
+  Q is the transient part of the transition matrix (scipy.sparse if
+  available, otherwise the sum of the propagated vectors).
+
+Players do not interact, so the multi-player results (win probability by
+seat, game length) follow from the single-player distribution.
+
+Requires numpy; scipy is optional.
+"""
+import numpy as np
+
+from SnakeLadder import Board, MultiDice
+
+try:
+    from scipy import sparse
+    from scipy.sparse.linalg import spsolve
+except ImportError:  # pragma: no cover - scipy is an optional dependency
+    sparse = None
+
+
+class MarkovAnalyzer:
+    """
+    Exact outcome statistics of a board layout.
+    """
+    def __init__(self, board, distribution=None, dice=None):
+        """
+        :param board: The Board to analyse; it is finalized if needed.
+        :param distribution: Dict mapping each roll to its probability.
+                             Defaults to one fair six-sided die.
+        :param dice: A DiceStrategy to take the distribution from instead.
+        """
+        if dice is not None:
+            distribution = dice.distribution()
+        if distribution is None:
+            distribution = {roll: 1 / 6 for roll in range(1, 7)}
+        if board.jump_table is None:
+            board.finalize()
+        self.board = board
+        self.size = size = board.size
+        self.rolls = np.array(sorted(distribution), dtype=np.int64)
+        self.probabilities = np.array([distribution[roll] for roll in self.rolls], dtype=float)
+
+        length = max(len(board.jump_table), size + int(self.rolls.max()) + 1)
+        table = np.arange(length, dtype=np.int64)
+        table[:len(board.jump_table)] = board.jump_table
+        # destinations[f, c]: where a player on cell c ends up after rolling rolls[f];
+        # index size stands for the absorbing "finished" state
+        self.destinations = np.minimum(table[np.arange(size)[None, :] + self.rolls[:, None]], size)
+        self._turns = None
+        self._visits = None
+
+    def transition_matrix(self):
+        """
+        Returns the (size + 1) x (size + 1) transition matrix as a scipy CSR
+        matrix. The last row and column are the absorbing "finished" state.
+        """
+        if sparse is None:
+            raise ImportError("transition_matrix requires scipy")
+        size = self.size
+        faces = len(self.rolls)
+        rows = np.concatenate([np.tile(np.arange(size), faces), [size]])
+        columns = np.concatenate([self.destinations.ravel(), [size]])
+        data = np.concatenate([np.repeat(self.probabilities, size), [1.0]])
+        return sparse.csr_matrix((data, (rows, columns)), shape=(size + 1, size + 1))
+
+    def _step(self, occupancy):
+        # Push a probability vector over the cells through one turn
+        step = np.zeros(self.size + 1)
+        for destinations, probability in zip(self.destinations, self.probabilities):
+            step += probability * np.bincount(destinations, weights=occupancy, minlength=self.size + 1)
+        return step
+
+    def turn_distribution(self, tolerance=1e-12, max_turns=1_000_000):
+        """
+        Returns an array f where f[t] is the probability that a player needs
+        exactly t turns to finish. Propagation stops once less than tolerance
+        probability is left on the board.
+        """
+        if self._turns is None:
+            occupancy = np.zeros(self.size)
+            occupancy[0] = 1.0
+            visits = occupancy.copy()
+            turns = [0.0]
+            remaining = 1.0
+            while remaining > tolerance and len(turns) <= max_turns:
+                step = self._step(occupancy)
+                turns.append(step[-1])
+                occupancy = step[:-1]
+                visits += occupancy
+                remaining = occupancy.sum()
+            self._turns = np.array(turns)
+            self._visits = visits
+        return self._turns
+
+    def expected_turns(self):
+        """
+        Returns the expected number of turns a single player needs to finish.
+        """
+        return float(self.expected_visits().sum())
+
+    def expected_visits(self):
+        """
+        Returns the expected number of turns a player starts on each cell,
+        including the start on cell 0. With scipy this is an exact sparse
+        solve; otherwise it is accumulated while propagating the distribution.
+        """
+        if sparse is not None:
+            transient = self.transition_matrix()[:self.size, :self.size]
+            start = np.zeros(self.size)
+            start[0] = 1.0
+            return spsolve((sparse.identity(self.size, format="csc") - transient.T).tocsc(), start)
+        self.turn_distribution()
+        return self._visits
+
+    def landing_frequency(self):
+        """
+        Returns the fraction of moves that end on each cell, comparable to
+        SimulationResult.landing_frequency in SnakeLadder_Simulator.py.
+        """
+        landings = self.expected_visits().copy()
+        landings[0] -= 1.0  # The start is not a landing
+        return landings / landings.sum()
+
+    def _finish_probabilities(self):
+        # f[k] = P(T = k) and survival[k] = P(T > k)
+        finish = self.turn_distribution()
+        survival = np.clip(1.0 - np.cumsum(finish), 0.0, 1.0)
+        return finish, survival
+
+    def seat_win_probabilities(self, num_players):
+        """
+        Returns the probability that each seat wins a game of num_players.
+        Seat s wins in round k if it finishes on its k-th turn, the seats
+        before it have not finished after k turns and the seats after it have
+        not finished after k - 1 turns.
+        """
+        finish, survival = self._finish_probabilities()
+        before = survival[1:]
+        after = survival[:-1]
+        return np.array([(finish[1:] * before ** seat * after ** (num_players - 1 - seat)).sum()
+                         for seat in range(num_players)])
+
+    def game_length_distribution(self, num_players):
+        """
+        Returns an array g where g[t] is the probability that a game of
+        num_players ends on turn t (counting every player's turns).
+        """
+        finish, survival = self._finish_probabilities()
+        rounds = len(finish) - 1
+        lengths = np.zeros(rounds * num_players + 1)
+        before = survival[1:]
+        after = survival[:-1]
+        for seat in range(num_players):
+            wins = finish[1:] * before ** seat * after ** (num_players - 1 - seat)
+            lengths[np.arange(rounds) * num_players + seat + 1] = wins
+        return lengths
+
+    def expected_game_length(self, num_players):
+        lengths = self.game_length_distribution(num_players)
+        return float((np.arange(len(lengths)) * lengths).sum())
+
+
+if __name__ == "__main__":
+    import time
+
+    from SnakeLadder_Simulator import BatchSimulator
+
+    # The board from SnakeLadder.py
+    board = Board(100)
+    for head, tail in ((14, 7), (31, 26), (78, 39), (98, 79)):
+        board.add_snake(head, tail)
+    for bottom, top in ((3, 22), (5, 8), (11, 26), (20, 29), (17, 95)):
+        board.add_ladder(bottom, top)
+
+    analyzer = MarkovAnalyzer(board)
+    print("Expected turns for one player:", analyzer.expected_turns())
+    print("Win probability by seat (3 players):", analyzer.seat_win_probabilities(3))
+    print("Expected game length (3 players):", analyzer.expected_game_length(3))
+
+    # The exact values are the ground truth for the simulator
+    # (check_batch_against_markov in SnakeLadder_benchmark.py asserts that they agree)
+    simulated = BatchSimulator(board, num_players=3, seed=1).run(200_000)
+    print("Simulated game length:", simulated.mean_length)
+    print("Simulated win probability by seat:", simulated.win_probabilities())
+
+    # Two dice instead of one
+    print("Expected turns with two dice:", MarkovAnalyzer(board, dice=MultiDice(2)).expected_turns())
+
+    # A large board is still analysed in well under a second
+    large = Board(20_000)
+    for start in range(50, 19_950, 97):
+        large.add_snake(start, start - 40)
+    for start in range(10, 19_900, 89):
+        large.add_ladder(start, start + 60)
+    start_time = time.perf_counter()
+    print("Expected turns on a 20k-cell board:", MarkovAnalyzer(large).expected_turns(),
+          f"({time.perf_counter() - start_time:.2f}s)")
@@ -0,0 +1,189 @@
+"""
+Batch Monte Carlo simulation of Snake and Ladder boards.
+
+Playing Game.play_turn in a Python loop is far too slow to measure outcome
+distributions for a board layout. BatchSimulator advances many independent
+games together: positions are a NumPy array with one row per game and one
+column per seat, dice rolls are drawn for all unfinished games at once, and
+snakes and ladders are applied by indexing the board's jump table.
+
+It uses the same rules as Game in SnakeLadder.py: players move in seat order
+starting with seat 0, one snake or ladder is applied after each move, and
+the first player to reach board.size or beyond wins.
+
+Requires numpy.
+"""
+import numpy as np
+
+from SnakeLadder import Board, Dice, Game, Player, derive_seed
+
+
+class SimulationResult:
+    """
+    Aggregate statistics of a batch of simulated games.
+    """
+    def __init__(self, num_players, game_lengths, winners, landings):
+        self.num_players = num_players
+        self.game_lengths = game_lengths  # Turns played in each game, -1 if unfinished
+        self.winners = winners  # Winning seat of each game, -1 if unfinished
+        self.landings = landings  # How often a player came to rest on each cell
+
+    @property
+    def games(self):
+        return len(self.game_lengths)
+
+    @property
+    def finished(self):
+        return int(np.count_nonzero(self.winners >= 0))
+
+    @property
+    def mean_length(self):
+        """
+        Average number of turns of the finished games.
+        """
+        return float(self.game_lengths[self.winners >= 0].mean())
+
+    def length_histogram(self):
+        """
+        Returns counts where entry t is the number of games that took t turns.
+        """
+        return np.bincount(self.game_lengths[self.winners >= 0])
+
+    def win_probabilities(self):
+        """
+        Returns the fraction of finished games won by each seat.
+        """
+        return np.bincount(self.winners[self.winners >= 0], minlength=self.num_players) / self.finished
+
+    def landing_frequency(self):
+        """
+        Returns the fraction of all moves that ended on each cell.
+        """
+        return self.landings / self.landings.sum()
+
+    def summary(self):
+        return {
+            "games": self.games,
+            "finished": self.finished,
+            "mean_length": self.mean_length,
+            "win_probabilities": self.win_probabilities().tolist(),
+        }
+
+
+class BatchSimulator:
+    """
+    Simulates many games of one board layout at once.
+    """
+    def __init__(self, board, num_players=2, seed=None, sides=6, dice=None):
+        """
+        :param board: The Board to play on; it is finalized if needed.
+        :param num_players: Number of seats in every game.
+        :param seed: Seed for the NumPy random generator, for reproducible runs.
+        :param sides: Number of sides of the (fair) die.
+        :param dice: A DiceStrategy whose distribution replaces the fair die.
+        """
+        if board.jump_table is None:
+            board.finalize()
+        self.board = board
+        self.num_players = num_players
+        self.sides = sides
+        self.rng = np.random.default_rng(seed)
+        if dice is not None:
+            distribution = dice.distribution()
+            self.faces = np.array(sorted(distribution), dtype=np.int64)
+            self.probabilities = np.array([distribution[face] for face in self.faces])
+            max_roll = int(self.faces.max())
+        else:
+            self.faces = None
+            max_roll = sides
+        # Cover every cell a move can reach, so a lookup never needs a bounds check
+        length = max(len(board.jump_table), board.size + max_roll + 1)
+        table = np.arange(length, dtype=np.int64)
+        table[:len(board.jump_table)] = board.jump_table
+        self.table = table
+
+    def _roll(self, count):
+        if self.faces is not None:
+            return self.rng.choice(self.faces, size=count, p=self.probabilities)
+        return self.rng.integers(1, self.sides + 1, size=count)
+
+    def run(self, num_games, max_rounds=10_000):
+        """
+        Plays num_games games to the end, or until max_rounds rounds have been played.
+        :return: A SimulationResult.
+        """
+        size = self.board.size
+        table = self.table
+        num_players = self.num_players
+        positions = np.zeros((num_games, num_players), dtype=np.int64)
+        game_lengths = np.full(num_games, -1, dtype=np.int64)
+        winners = np.full(num_games, -1, dtype=np.int64)
+        landings = np.zeros(size, dtype=np.int64)
+        active = np.arange(num_games)  # Games that are still being played
+
+        for round_number in range(max_rounds):
+            for seat in range(num_players):
+                moved = table[positions[active, seat] + self._roll(active.size)]
+                positions[active, seat] = moved
+                won = moved >= size
+                landings += np.bincount(moved[~won], minlength=size)
+                if won.any():
+                    finished = active[won]
+                    game_lengths[finished] = round_number * num_players + seat + 1
+                    winners[finished] = seat
+                    active = active[~won]
+                    if active.size == 0:
+                        break
+            if active.size == 0:
+                break
+
+        return SimulationResult(num_players, game_lengths, winners, landings)
+
+
+def compare_with_scalar(board, num_players=2, games=5_000, seed=0):
+    """
+    Runs the batch simulator and the scalar Game.play_fast on the same board
+    and reports how far apart their estimates are in standard errors.
+    A |z| well below 3 for the mean length and every seat means the two agree;
+    check_batch_against_scalar in SnakeLadder_benchmark.py asserts it.
+    """
+    batch = BatchSimulator(board, num_players, seed=seed).run(games)
+
+    scalar_lengths = []
+    scalar_winners = []
+    for game_index in range(games):
+        players = [Player(f"Player {seat + 1}") for seat in range(num_players)]
+        dice = Dice(seed=derive_seed(seed, game_index), block_size=64)
+        winner, turns = Game(board, players, dice=dice).play_fast()
+        scalar_lengths.append(turns)
+        scalar_winners.append(players.index(winner))
+    scalar_lengths = np.array(scalar_lengths)
+    scalar_wins = np.bincount(scalar_winners, minlength=num_players) / games
+
+    batch_lengths = batch.game_lengths[batch.winners >= 0]
+    length_error = np.sqrt(batch_lengths.var() / batch_lengths.size + scalar_lengths.var() / scalar_lengths.size)
+    batch_wins = batch.win_probabilities()
+    pooled = (batch_wins + scalar_wins) / 2
+    win_error = np.sqrt(pooled * (1 - pooled) * (1 / batch.finished + 1 / games))
+    return {
+        "batch_mean_length": float(batch_lengths.mean()),
+        "scalar_mean_length": float(scalar_lengths.mean()),
+        "length_z": float((batch_lengths.mean() - scalar_lengths.mean()) / length_error),
+        "batch_win_probabilities": batch_wins.tolist(),
+        "scalar_win_probabilities": scalar_wins.tolist(),
+        "win_z": ((batch_wins - scalar_wins) / win_error).tolist(),
+    }
+
+
+if __name__ == "__main__":
+    # The board from SnakeLadder.py
+    board = Board(100)
+    for head, tail in ((14, 7), (31, 26), (78, 39), (98, 79)):
+        board.add_snake(head, tail)
+    for bottom, top in ((3, 22), (5, 8), (11, 26), (20, 29), (17, 95)):
+        board.add_ladder(bottom, top)
+
+    result = BatchSimulator(board, num_players=3, seed=42).run(100_000)
+    print("Summary:", result.summary())
+    print("Most visited cells:", np.argsort(result.landing_frequency())[::-1][:5].tolist())
+    print("Agreement with Game:", compare_with_scalar(board, num_players=3))
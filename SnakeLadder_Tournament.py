@@ -0,0 +1,191 @@
+"""
+Multi-process tournament runner for Snake and Ladder boards.
+
+Evaluates many board layouts for several player counts by playing games with
+Game.play_fast in a pool of worker processes. Work is cut into tasks of a
+fixed number of games; every task gets its own seed derived from
+(seed, board index, player count, task index), so results are the same
+whatever the number of workers or the order in which tasks finish.
+
+Boards travel to the workers as compact specs (size, snakes, ladders) of
+plain tuples instead of pickled Board objects, and workers send back small
+BoardStats objects that the parent merges per board and player count.
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from SnakeLadder import Board, Dice, Game, Player, derive_seed
+
+
+def board_spec(board):
+    """
+    Returns a compact, picklable description of a board:
+    (size, ((head, tail), ...), ((bottom, top), ...)).
+    """
+    return board.size, tuple(sorted(board.snakes.items())), tuple(sorted(board.ladders.items()))
+
+
+def build_board(spec):
+    """
+    Rebuilds a finalized Board from a spec made by board_spec.
+    """
+    size, snakes, ladders = spec
+    board = Board(size)
+    for head, tail in snakes:
+        board.add_snake(head, tail)
+    for bottom, top in ladders:
+        board.add_ladder(bottom, top)
+    return board.finalize()
+
+
+class BoardStats:
+    """
+    Outcome statistics of the games played on one board with one player count.
+    Partial statistics from different tasks are combined with merge.
+    """
+    def __init__(self, num_players):
+        self.num_players = num_players
+        self.games = 0
+        self.unfinished = 0  # Games stopped by max_turns without a winner
+        self.total_turns = 0
+        self.total_squared_turns = 0
+        self.shortest = None
+        self.longest = None
+        self.wins = [0] * num_players
+
+    def add_game(self, winner_seat, turns):
+        self.games += 1
+        if winner_seat is None:
+            self.unfinished += 1
+            return
+        self.wins[winner_seat] += 1
+        self.total_turns += turns
+        self.total_squared_turns += turns * turns
+        self.shortest = turns if self.shortest is None else min(self.shortest, turns)
+        self.longest = turns if self.longest is None else max(self.longest, turns)
+
+    def merge(self, other):
+        self.games += other.games
+        self.unfinished += other.unfinished
+        self.total_turns += other.total_turns
+        self.total_squared_turns += other.total_squared_turns
+        for bound, pick in (("shortest", min), ("longest", max)):
+            values = [value for value in (getattr(self, bound), getattr(other, bound)) if value is not None]
+            setattr(self, bound, pick(values) if values else None)
+        self.wins = [mine + theirs for mine, theirs in zip(self.wins, other.wins)]
+        return self
+
+    @property
+    def finished(self):
+        return self.games - self.unfinished
+
+    @property
+    def mean_length(self):
+        return self.total_turns / self.finished
+
+    @property
+    def length_variance(self):
+        mean = self.mean_length
+        return self.total_squared_turns / self.finished - mean * mean
+
+    def win_probabilities(self):
+        return [wins / self.finished for wins in self.wins]
+
+    def summary(self):
+        return {
+            "games": self.games,
+            "unfinished": self.unfinished,
+            "mean_length": self.mean_length,
+            "shortest": self.shortest,
+            "longest": self.longest,
+            "win_probabilities": self.win_probabilities(),
+        }
+
+
+def _play_task(spec, num_players, games, seed, max_turns):
+    # Runs in a worker process: play games on one board with one seeded dice
+    board = build_board(spec)
+    dice = Dice(seed=seed)
+    stats = BoardStats(num_players)
+    for _ in range(games):
+        players = [Player(f"Player {seat + 1}") for seat in range(num_players)]
+        winner, turns = Game(board, players, dice=dice).play_fast(max_turns)
+        stats.add_game(None if winner is None else players.index(winner), turns)
+    return stats
+
+
+def iter_tournament(boards, player_counts=(2,), games=1_000, task_games=250, seed=0,
+                    workers=None, max_turns=100_000):
+    """
+    Plays games on every board for every player count in a process pool.
+    Yields (board index, player count, partial BoardStats) as tasks finish.
+    At most two tasks per worker are queued at a time.
+    :param boards: Boards or specs made by board_spec.
+    :param games: Games per board and player count.
+    :param task_games: Games per task sent to a worker.
+    """
+    specs = [board if isinstance(board, tuple) else board_spec(board) for board in boards]
+    tasks = (
+        (board_index, num_players, derive_seed(seed, board_index, num_players, task_index),
+         min(task_games, games - task_index * task_games))
+        for board_index in range(len(specs))
+        for num_players in player_counts
+        for task_index in range((games + task_games - 1) // task_games)
+    )
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}  # future -> (board index, player count)
+
+        def submit_next():
+            for board_index, num_players, task_seed, task_size in tasks:
+                future = executor.submit(_play_task, specs[board_index], num_players,
+                                         task_size, task_seed, max_turns)
+                pending[future] = (board_index, num_players)
+                return True
+            return False
+
+        while len(pending) < 2 * workers and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                board_index, num_players = pending.pop(future)
+                yield board_index, num_players, future.result()
+                submit_next()
+
+
+def run_tournament(boards, player_counts=(2,), games=1_000, task_games=250, seed=0,
+                   workers=None, max_turns=100_000):
+    """
+    Runs iter_tournament to the end and merges the partial results.
+    :return: Dict mapping (board index, player count) to BoardStats.
+    """
+    results = {}
+    for board_index, num_players, stats in iter_tournament(boards, player_counts, games, task_games,
+                                                           seed, workers, max_turns):
+        key = (board_index, num_players)
+        if key in results:
+            results[key].merge(stats)
+        else:
+            results[key] = stats
+    return results
+
+
+if __name__ == "__main__":
+    # Candidate layouts: the board from SnakeLadder.py with ladders of different lengths
+    boards = []
+    for ladder_length in (10, 20, 40, 80):
+        board = Board(100)
+        for head, tail in ((14, 7), (31, 26), (78, 39), (98, 79)):
+            board.add_snake(head, tail)
+        board.add_ladder(17, min(17 + ladder_length, 99))
+        boards.append(board)
+
+    for workers in (1, os.cpu_count() or 1):
+        start = time.perf_counter()
+        results = run_tournament(boards, player_counts=(2, 4), games=4_000, workers=workers)
+        print(f"{workers} worker(s): {time.perf_counter() - start:.2f}s")
+
+    for (board_index, num_players), stats in sorted(results.items()):
+        print(f"Board {board_index}, {num_players} players:", stats.summary())
@@ -0,0 +1,93 @@
+"""
+Checks and benchmarks for the Snake and Ladder simulators.
+
+Run it directly:
+    python SnakeLadder_benchmark.py
+
+The agreement check plays the same board with BatchSimulator and with the
+scalar Game.play_fast and asserts that the mean game length and the win
+probability of every seat agree within max_z standard errors. The
+simulators draw different dice, so they are compared statistically; the
+seeds are fixed, so the check gives the same result on every run. The
+Markov check compares BatchSimulator in the same way with the exact values
+from MarkovAnalyzer, which are the ground truth for both simulators.
+
+The throughput benchmark times both simulators on that board.
+
+Requires numpy.
+"""
+import time
+
+import numpy as np
+
+from SnakeLadder import Board, Dice, Game, Player, derive_seed
+from SnakeLadder_Markov import MarkovAnalyzer
+from SnakeLadder_Simulator import BatchSimulator, compare_with_scalar
+
+
+def _board():
+    # The board from SnakeLadder.py
+    board = Board(100)
+    for head, tail in ((14, 7), (31, 26), (78, 39), (98, 79)):
+        board.add_snake(head, tail)
+    for bottom, top in ((3, 22), (5, 8), (11, 26), (20, 29), (17, 95)):
+        board.add_ladder(bottom, top)
+    return board
+
+
+def check_batch_against_scalar(num_players=3, games=5_000, seed=0, max_z=4.0):
+    """
+    Asserts that BatchSimulator and Game.play_fast agree on the same board.
+    """
+    agreement = compare_with_scalar(_board(), num_players=num_players, games=games, seed=seed)
+    z_scores = [agreement["length_z"]] + agreement["win_z"]
+    assert max(abs(z) for z in z_scores) <= max_z, f"batch and scalar simulators disagree: {agreement}"
+    print(f"  batch vs Game.play_fast: mean length {agreement['batch_mean_length']:.2f} vs "
+          f"{agreement['scalar_mean_length']:.2f}, largest |z| {max(abs(z) for z in z_scores):.2f}")
+
+
+def check_batch_against_markov(num_players=3, games=200_000, seed=1, max_z=4.0):
+    """
+    Asserts that BatchSimulator matches the exact mean game length and win
+    probability by seat from MarkovAnalyzer.
+    """
+    board = _board()
+    analyzer = MarkovAnalyzer(board)
+    result = BatchSimulator(board, num_players, seed=seed).run(games)
+    lengths = result.game_lengths[result.winners >= 0]
+
+    expected_length = analyzer.expected_game_length(num_players)
+    length_z = (lengths.mean() - expected_length) / np.sqrt(lengths.var() / lengths.size)
+    expected_wins = analyzer.seat_win_probabilities(num_players)
+    win_error = np.sqrt(expected_wins * (1 - expected_wins) / result.finished)
+    win_z = (result.win_probabilities() - expected_wins) / win_error
+    z_scores = [float(length_z)] + win_z.tolist()
+    assert max(abs(z) for z in z_scores) <= max_z, \
+        f"simulator disagrees with the Markov chain: length {lengths.mean()} vs {expected_length}, " \
+        f"wins {result.win_probabilities().tolist()} vs {expected_wins.tolist()}"
+    print(f"  batch vs Markov chain: mean length {lengths.mean():.2f} vs {expected_length:.2f}, "
+          f"largest |z| {max(abs(z) for z in z_scores):.2f}")
+
+
+def benchmark_simulators(num_players=3, games=20_000, seed=0):
+    """
+    Prints games simulated per second by Game.play_fast and by BatchSimulator.
+    """
+    board = _board()
+    start = time.perf_counter()
+    for game_index in range(games):
+        players = [Player(f"Player {seat + 1}") for seat in range(num_players)]
+        Game(board, players, dice=Dice(seed=derive_seed(seed, game_index), block_size=64)).play_fast()
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    BatchSimulator(board, num_players, seed=seed).run(games)
+    batch_seconds = time.perf_counter() - start
+    print(f"  Game.play_fast  {games / scalar_seconds:12,.0f} games/s")
+    print(f"  BatchSimulator  {games / batch_seconds:12,.0f} games/s")
+
+
+if __name__ == "__main__":
+    check_batch_against_scalar()
+    check_batch_against_markov()
+    benchmark_simulators()
@@ -1,5 +1,15 @@
+import asyncio
+import heapq
+import math
+import os
+import random
+import struct
+import sys
+import threading
 import time
-from collections import defaultdict, deque
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
 
 """
 "How can you implement a system to track and display the top 10 purchased items 
@@ -11,32 +21,791 @@ Calculating the top 10 items based on purchase counts from the last hour.
 
 
 """
+class RankedCounts:
+    """
+    Indexed binary heap of item counts, kept up to date as counts change.
+    Entries are ordered by (-count, sequence), where sequence records when the
+    item entered the window. That is the same order a stable sort of the items
+    dict by descending count produces, so ties come out identically.
+    Updates cost O(log U) in the number of items U; reading the top N walks
+    the heap from the root with a small frontier heap in O(N log N).
+    """
+    def __init__(self):
+        self._heap = []  # Entries [-count, sequence, item]
+        self._position = {}  # item -> index of its entry in _heap
+        self._next_sequence = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, item, delta):
+        # Change the count of item by delta, dropping it when it reaches zero
+        index = self._position.get(item)
+        if index is None:
+            if delta <= 0:
+                return
+            self._heap.append([-delta, self._next_sequence, item])
+            self._next_sequence += 1
+            self._position[item] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+        entry = self._heap[index]
+        entry[0] -= delta
+        if entry[0] >= 0:
+            self._remove_at(index)
+        elif delta > 0:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def discard(self, item):
+        index = self._position.get(item)
+        if index is not None:
+            self._remove_at(index)
+
+    def top(self, top_n):
+        # Return the top_n (item, count) pairs, highest count first
+        heap = self._heap
+        result = []
+        if not heap or top_n <= 0:
+            return result
+        frontier = [(heap[0][0], heap[0][1], 0)]
+        size = len(heap)
+        while frontier and len(result) < top_n:
+            negative_count, _, index = heapq.heappop(frontier)
+            result.append((heap[index][2], -negative_count))
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size:
+                    entry = heap[child]
+                    heapq.heappush(frontier, (entry[0], entry[1], child))
+        return result
+
+    def _remove_at(self, index):
+        heap = self._heap
+        entry = heap[index]
+        del self._position[entry[2]]
+        last = heap.pop()
+        if index < len(heap):
+            heap[index] = last
+            self._position[last[2]] = index
+            self._sift_up(index)
+            self._sift_down(self._position[last[2]])
+
+    def _sift_up(self, index):
+        heap = self._heap
+        position = self._position
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_entry = heap[parent]
+            if entry < parent_entry:
+                heap[index] = parent_entry
+                position[parent_entry[2]] = index
+                index = parent
+            else:
+                break
+        heap[index] = entry
+        position[entry[2]] = index
+
+    def _sift_down(self, index):
+        heap = self._heap
+        position = self._position
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and heap[right] < heap[child]:
+                child = right
+            if heap[child] < entry:
+                heap[index] = heap[child]
+                position[heap[index][2]] = index
+                index = child
+            else:
+                break
+        heap[index] = entry
+        position[entry[2]] = index
+
+
 class TopItemsCalculator:
-    def __init__(self, time_window=3600):
+    """
+    Tracks purchase counts over a sliding time window.
+
+    By default every purchase is kept as an (item, timestamp) pair and expires
+    exactly time_window seconds later. Passing bucket_size switches to the
+    bucketed window: purchases are counted per item inside buckets that are
+    bucket_size seconds wide, and a whole bucket expires at once when its
+    newest possible purchase is older than time_window. Memory then grows with
+    the number of buckets times the items active in each, not with the number
+    of purchases.
+
+    Accuracy trade-off of the bucketed window: a purchase is counted for
+    between time_window and time_window + bucket_size seconds, so counts can
+    include up to bucket_size seconds of purchases that the exact window has
+    already dropped. Smaller buckets are more accurate and use more memory.
+    """
+    def __init__(self, time_window=3600, bucket_size=None):
+        if bucket_size is not None and bucket_size <= 0:
+            raise ValueError("bucket_size must be positive")
         self.time_window = time_window
+        self.bucket_size = bucket_size
         self.items = defaultdict(int)
-        self.timestamps = deque()
+        self.timestamps = deque()  # (item, timestamp) per purchase, exact window only
+        self._restored = None  # Purchases loaded from a snapshot, older than those in timestamps
+        self.buckets = deque()  # [bucket_start, {item: count}], bucketed window only
         self.current_time = time.time()
+        self.latest = None  # Newest purchase time seen: the window's clock
+        self.ranking = RankedCounts()  # Kept in step with self.items for fast top-N reads
 
     def add_purchase(self, item):
         now = time.time()
+        if self.latest is None or now > self.latest:
+            self.latest = now
         self.items[item] += 1
-        self.timestamps.append((item, now))
+        self.ranking.add(item, 1)
+        if self.bucket_size is None:
+            self.timestamps.append((item, now))
+        else:
+            self._bucket_for(now)[item] += 1
         self.cleanup_old_items(now)
 
+    def add_purchases(self, purchases):
+        """
+        Adds a batch of (item, timestamp) purchases, oldest first.
+        A timestamp of None means "now"; the clock is read once for the whole
+        batch. Counts are aggregated per item before touching the ranking, and
+        old purchases are expired once, after the batch, against its newest
+        timestamp. The resulting counts match adding the purchases one by one.
+        The window follows the purchase timestamps, not the wall clock, so a
+        log of historical purchases can be replayed.
+        """
+        batch_counts = Counter()
+        batch_time = None
+        latest = None
+        exact = self.bucket_size is None
+        append = self.timestamps.append
+        for item, timestamp in purchases:
+            if timestamp is None:
+                if batch_time is None:
+                    batch_time = time.time()
+                timestamp = batch_time
+            batch_counts[item] += 1
+            if exact:
+                append((item, timestamp))
+            else:
+                self._bucket_for(timestamp)[item] += 1
+            if latest is None or timestamp > latest:
+                latest = timestamp
+
+        items = self.items
+        add = self.ranking.add
+        for item, count in batch_counts.items():
+            items[item] += count
+            add(item, count)
+        if latest is not None:
+            if self.latest is None or latest > self.latest:
+                self.latest = latest
+            self.cleanup_old_items(latest)
+
+    def _bucket_for(self, timestamp):
+        # Return the counts of the bucket holding timestamp, opening a new one if needed.
+        # Late purchases that belong to an older bucket are counted in the newest one.
+        start = timestamp - timestamp % self.bucket_size
+        buckets = self.buckets
+        if not buckets or start > buckets[-1][0]:
+            buckets.append([start, defaultdict(int)])
+        return buckets[-1][1]
+
     def cleanup_old_items(self, now):
+        if self.bucket_size is not None:
+            self._cleanup_old_buckets(now)
+            return
+        if self._restored is not None and not self._expire_restored(now):
+            return  # Restored purchases are older than the deque, so it has nothing to expire yet
         # Remove items older than the time window
         while self.timestamps and (now - self.timestamps[0][1]) > self.time_window:
             old_item, old_time = self.timestamps.popleft()
             if old_time < now - self.time_window:
                 self.items[old_item] -= 1
+                self.ranking.add(old_item, -1)
                 if self.items[old_item] <= 0:
                     del self.items[old_item]
+                    self.ranking.discard(old_item)
+
+    def _cleanup_old_buckets(self, now):
+        # Drop whole buckets once even their newest purchase is outside the window
+        buckets = self.buckets
+        while buckets and now - (buckets[0][0] + self.bucket_size) >= self.time_window:
+            _, counts = buckets.popleft()
+            self._uncount(counts.items())
+
+    def _expire_restored(self, now):
+        # Expire restored purchases like cleanup_old_items expires the deque.
+        # Returns True once all of them are gone.
+        restored = self._restored
+        end = bisect_left(restored.timestamps, now - self.time_window, restored.start)
+        if end > restored.start:
+            expired = Counter(restored.events[restored.start:end])
+            restored.start = end
+            table = restored.table
+            self._uncount((table[item_id], count) for item_id, count in expired.items())
+        if restored.start < len(restored.events):
+            return False
+        self._restored = None
+        return True
+
+    def _uncount(self, counts):
+        # Subtract (item, count) pairs of expired purchases
+        for old_item, count in counts:
+            self.items[old_item] -= count
+            self.ranking.add(old_item, -count)
+            if self.items[old_item] <= 0:
+                del self.items[old_item]
+                self.ranking.discard(old_item)
+
+    # Snapshot layout: header, item table, the window count of every item in
+    # the table (int64), then the window as parallel arrays.
+    # Exact window:    item ids (uint32) and timestamps (float64), one per purchase.
+    # Bucketed window: bucket starts (float64), entries per bucket (uint32),
+    #                  then item ids (uint32) and counts (int64), one per entry.
+    SNAPSHOT_MAGIC = b"TOPK"
+    SNAPSHOT_VERSION = 2
+    _SNAPSHOT_HEADER = struct.Struct("<4sHBBddQQQQ")
+
+    def save_snapshot(self, path):
+        """
+        Writes the window state to path in a compact binary format.
+        The file is written next to path and renamed over it, so a reader never
+        sees a half-written snapshot. Items must be strings.
+        Safe to call while another thread adds purchases: the window is copied
+        first (each copy is a single C-level operation the GIL does not
+        interrupt), and the snapshot describes the window at that moment.
+        """
+        item_ids = {}
+        for item in list(self.items):
+            item_ids[item] = len(item_ids)
+        if self.bucket_size is None:
+            restored = self._restored
+            timestamps = list(self.timestamps)
+            if restored is not None:
+                start = restored.start
+                restored_ids = [item_ids.setdefault(item, len(item_ids)) for item in restored.table]
+                events = array('I', map(restored_ids.__getitem__, restored.events[start:]))
+                stamps = restored.timestamps[start:]
+            else:
+                events = array('I')
+                stamps = array('d')
+            for item, _ in timestamps:
+                item_ids.setdefault(item, len(item_ids))
+            events.extend([item_ids[item] for item, _ in timestamps])
+            stamps.extend([timestamp for _, timestamp in timestamps])
+            counts = Counter(events)
+            columns = [events, stamps]
+            rows, entries = len(events), 0
+        else:
+            starts = array('d')
+            sizes = array('I')
+            entry_items = array('I')
+            entry_counts = array('q')
+            counts = Counter()
+            for start, bucket in [(start, dict(bucket)) for start, bucket in list(self.buckets)]:
+                starts.append(start)
+                sizes.append(len(bucket))
+                for item, count in bucket.items():
+                    item_id = item_ids.setdefault(item, len(item_ids))
+                    entry_items.append(item_id)
+                    entry_counts.append(count)
+                    counts[item_id] += count
+            columns = [starts, sizes, entry_items, entry_counts]
+            rows, entries = len(starts), len(entry_items)
+
+        try:
+            encoded = [item.encode("utf-8") for item in item_ids]
+        except AttributeError:
+            raise TypeError("snapshots only support string items") from None
+        lengths = array('I', map(len, encoded))
+        blob_size = sum(lengths)
+        totals = array('q', map(counts.__getitem__, range(len(encoded))))
+        if sys.byteorder != "little":
+            for column in [lengths, totals] + columns:
+                column.byteswap()
+
+        header = self._SNAPSHOT_HEADER.pack(
+            self.SNAPSHOT_MAGIC, self.SNAPSHOT_VERSION, self.bucket_size is not None, 0,
+            self.time_window, self.bucket_size or 0.0,
+            len(encoded), blob_size, rows, entries)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as snapshot:
+            snapshot.write(header)
+            lengths.tofile(snapshot)
+            snapshot.write(b"".join(encoded))
+            totals.tofile(snapshot)
+            for column in columns:
+                column.tofile(snapshot)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load_snapshot(cls, path, now=None):
+        """
+        Restores a calculator from a snapshot written by save_snapshot.
+        Purchases that have left the window by now (default: the current
+        time) are pruned while loading, before any structure is built.
+        The counts are read from the snapshot rather than recounted. An exact
+        window keeps its purchases in the loaded arrays, which expire like the
+        deque but without creating one tuple per purchase, so a window of
+        millions of purchases restores in well under a second (see
+        benchmark_snapshot in TopTenPurchased_benchmark.py).
+        """
+        if now is None:
+            now = time.time()
+        with open(path, "rb") as snapshot:
+            header = snapshot.read(cls._SNAPSHOT_HEADER.size)
+            (magic, version, bucketed, _reserved, time_window, bucket_size,
+             item_count, blob_size, rows, entries) = cls._SNAPSHOT_HEADER.unpack(header)
+            if magic != cls.SNAPSHOT_MAGIC or version != cls.SNAPSHOT_VERSION:
+                raise ValueError(f"{path} is not a version {cls.SNAPSHOT_VERSION} TopItemsCalculator snapshot")
+
+            def read(typecode, count):
+                column = array(typecode)
+                column.fromfile(snapshot, count)
+                if sys.byteorder != "little":
+                    column.byteswap()
+                return column
+
+            lengths = read('I', item_count)
+            blob = snapshot.read(blob_size)
+            table = []
+            offset = 0
+            for length in lengths:
+                table.append(blob[offset:offset + length].decode("utf-8"))
+                offset += length
+            counts = read('q', item_count)
+
+            calculator = cls(time_window, bucket_size if bucketed else None)
+            if not bucketed:
+                events = read('I', rows)
+                timestamps = read('d', rows)
+                first_live = bisect_left(timestamps, now - time_window)
+                for item_id, count in Counter(events[:first_live]).items():
+                    counts[item_id] -= count
+                if first_live < rows:
+                    calculator._restored = _RestoredPurchases(table, events, timestamps, first_live)
+            else:
+                starts = read('d', rows)
+                sizes = read('I', rows)
+                entry_items = read('I', entries)
+                entry_counts = read('q', entries)
+                offset = 0
+                for start, size in zip(starts, sizes):
+                    end = offset + size
+                    if now - (start + bucket_size) < time_window:
+                        calculator.buckets.append([start, defaultdict(
+                            int, zip(map(table.__getitem__, entry_items[offset:end]), entry_counts[offset:end]))])
+                    else:
+                        for item_id, count in zip(entry_items[offset:end], entry_counts[offset:end]):
+                            counts[item_id] -= count
+                    offset = end
+
+        # Rebuild counts in item table order, which preserves the tie order
+        items = calculator.items
+        add = calculator.ranking.add
+        for item, count in zip(table, counts):
+            if count > 0:
+                items[item] = count
+                add(item, count)
+        calculator.cleanup_old_items(now)
+        return calculator
+
+    def get_top_items(self, top_n=10, now=None):
+        # Read the top N from the ranked heap instead of sorting every item.
+        # Purchases expire as newer ones arrive; pass now to also expire
+        # against the wall clock (or any other time) before reading.
+        if now is not None:
+            self.cleanup_old_items(now)
+        if top_n is None or top_n < 0:
+            # Slice semantics (everything, or all but the last few) need the full order
+            sorted_items = sorted(self.items.items(), key=lambda x: x[1], reverse=True)
+            return sorted_items[:top_n]
+        return self.ranking.top(top_n)
+
+class _RestoredPurchases:
+    # The exact window as loaded from a snapshot: parallel arrays of item ids
+    # (into table) and timestamps. Purchases before start have expired.
+    __slots__ = ("table", "events", "timestamps", "start")
+
+    def __init__(self, table, events, timestamps, start):
+        self.table = table
+        self.events = events
+        self.timestamps = timestamps
+        self.start = start
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: a depth x width table of counters with one hash per row.
+    An estimate never undercounts, and with probability 1 - e^-depth it
+    overcounts by at most (e / width) times the total count added.
+    """
+    PRIME = (1 << 61) - 1
+
+    def __init__(self, width=2048, depth=4, seed=0):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.table = array('q', bytes(8 * width * depth))  # Row-major counters
+        rng = random.Random(seed)
+        self._hashes = [(rng.randrange(1, self.PRIME), rng.randrange(self.PRIME)) for _ in range(depth)]
+
+    def cells(self, item):
+        # Table index of item in every row
+        h = hash(item)
+        width = self.width
+        prime = self.PRIME
+        return [row * width + (a * h + b) % prime % width for row, (a, b) in enumerate(self._hashes)]
+
+    def add(self, item, count=1, cells=None):
+        table = self.table
+        for cell in cells or self.cells(item):
+            table[cell] += count
+        self.total += count
+
+    def estimate(self, item, cells=None):
+        table = self.table
+        return min(table[cell] for cell in cells or self.cells(item))
+
+    def subtract(self, other):
+        # Remove the counts of a sketch built with the same width, depth and seed
+        table = self.table
+        for cell, count in enumerate(other.table):
+            if count:
+                table[cell] -= count
+        self.total -= other.total
+
+    def clear(self):
+        self.table = array('q', bytes(8 * self.width * self.depth))
+        self.total = 0
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary that monitors at most capacity items.
+    When a new item arrives and the summary is full, it replaces the item with
+    the smallest counter and inherits that counter. Every item whose true count
+    exceeds total / capacity is guaranteed to be monitored.
+    """
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}  # Monitored item -> counter
+        self._heap = []  # Lazy min-heap of (counter, sequence, item)
+        self._sequence = 0
+
+    def add(self, item, count=1):
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+        else:
+            smallest, evicted = self._pop_min()
+            del counts[evicted]
+            counts[item] = smallest + count
+        self._push(item, counts[item])
+
+    def _push(self, item, count):
+        heapq.heappush(self._heap, (count, self._sequence, item))
+        self._sequence += 1
+        if len(self._heap) > 4 * self.capacity:
+            # Drop stale entries so the heap stays proportional to capacity
+            self._heap = [(count, sequence, item) for sequence, (item, count) in enumerate(self.counts.items())]
+            heapq.heapify(self._heap)
+            self._sequence = len(self._heap)
+
+    def _pop_min(self):
+        heap = self._heap
+        while True:
+            count, _, item = heapq.heappop(heap)
+            if self.counts.get(item) == count:
+                return count, item
+
+    def clear(self):
+        self.counts = {}
+        self._heap = []
+        self._sequence = 0
+
+
+class ApproximateTopItemsCalculator:
+    """
+    Fixed-memory alternative to TopItemsCalculator for very many distinct items.
+
+    The window is split into panes of time_window / panes seconds. Each pane
+    keeps a Count-Min Sketch and a Space-Saving summary; a running sketch holds
+    the sum of the live panes. When a pane leaves the window its sketch is
+    subtracted and its summary cleared, so memory stays at
+    panes x (width x depth counters + capacity items) whatever the stream.
+
+    Candidates for the top items come from the pane summaries and are ranked
+    by their windowed sketch estimate. Like the bucketed window, a purchase is
+    counted for between time_window - time_window / panes and time_window
+    seconds. error_bounds() reports the sketch guarantee for the current window.
+    """
+    def __init__(self, time_window=3600, width=2048, depth=4, capacity=1000, panes=60, seed=0):
+        self.time_window = time_window
+        self.pane_size = time_window / panes
+        self.capacity = capacity
+        self.window_sketch = CountMinSketch(width, depth, seed)
+        self.panes = deque()  # [pane_id, CountMinSketch, SpaceSaving], oldest first
+        self._pane_count = panes
+        self._spare = []  # Cleared panes, reused instead of allocating new tables
+        self._width, self._depth, self._seed = width, depth, seed
+        self.latest = None  # Newest purchase time seen: the window's clock
+
+    def add_purchase(self, item):
+        now = time.time()
+        if self.latest is None or now > self.latest:
+            self.latest = now
+        self.cleanup_old_items(now)
+        pane = self._pane_for(now)
+        cells = self.window_sketch.cells(item)
+        self.window_sketch.add(item, 1, cells)
+        pane[1].add(item, 1, cells)
+        pane[2].add(item)
+
+    def add_purchases(self, purchases):
+        """
+        Adds a batch of (item, timestamp) purchases, oldest first.
+        A timestamp of None means "now"; the clock is read once for the batch.
+        """
+        batch_time = None
+        pane = None
+        pane_id = None
+        window_add = self.window_sketch.add
+        cells_of = self.window_sketch.cells
+        for item, timestamp in purchases:
+            if timestamp is None:
+                if batch_time is None:
+                    batch_time = time.time()
+                timestamp = batch_time
+            if self.latest is None or timestamp > self.latest:
+                self.latest = timestamp
+            if pane is None or int(timestamp // self.pane_size) != pane_id:
+                self.cleanup_old_items(timestamp)
+                pane = self._pane_for(timestamp)
+                pane_id = pane[0]
+            cells = cells_of(item)
+            window_add(item, 1, cells)
+            pane[1].add(item, 1, cells)
+            pane[2].add(item)
+
+    def _pane_for(self, now):
+        pane_id = int(now // self.pane_size)
+        panes = self.panes
+        if not panes or pane_id > panes[-1][0]:
+            if self._spare:
+                sketch, summary = self._spare.pop()
+            else:
+                sketch = CountMinSketch(self._width, self._depth, self._seed)
+                summary = SpaceSaving(self.capacity)
+            panes.append([pane_id, sketch, summary])
+        return panes[-1]
+
+    def cleanup_old_items(self, now):
+        # Drop panes that are entirely outside the window
+        oldest_live = int(now // self.pane_size) - self._pane_count + 1
+        panes = self.panes
+        while panes and panes[0][0] < oldest_live:
+            _, sketch, summary = panes.popleft()
+            self.window_sketch.subtract(sketch)
+            sketch.clear()
+            summary.clear()
+            self._spare.append((sketch, summary))
+
+    def get_top_items(self, top_n=10, now=None):
+        # Expire against the newest purchase seen, like TopItemsCalculator, or against now if given
+        if now is None:
+            now = self.latest
+        if now is not None:
+            self.cleanup_old_items(now)
+        candidates = set()
+        for _, _, summary in self.panes:
+            candidates.update(summary.counts)
+        estimate = self.window_sketch.estimate
+        estimates = ((item, estimate(item)) for item in candidates)
+        if top_n is None or top_n < 0:
+            # Same slice semantics as TopItemsCalculator
+            return sorted(estimates, key=lambda x: x[1], reverse=True)[:top_n]
+        return heapq.nlargest(top_n, estimates, key=lambda x: x[1])
+
+    def error_bounds(self):
+        """
+        Returns the accuracy guarantee for the current window:
+        each count overestimates by at most max_overcount with probability
+        1 - delta, and every item bought more than heavy_hitter_threshold
+        times in some pane is a candidate.
+        """
+        total = self.window_sketch.total
+        epsilon = math.e / self.window_sketch.width
+        return {
+            "window_total": total,
+            "epsilon": epsilon,
+            "delta": math.exp(-self.window_sketch.depth),
+            "max_overcount": epsilon * total,
+            "heavy_hitter_threshold": total / self.capacity,
+        }
+
+
+class ConcurrentTopItemsCalculator:
+    """
+    Thread-safe TopItemsCalculator that shards items by hash.
+    Each shard is an independent TopItemsCalculator behind its own lock, so
+    threads adding different items rarely wait on each other. An item always
+    lands in the same shard, which makes each shard's top N a superset of that
+    shard's share of the global top N; reads lock every shard (always in the
+    same order), expire old purchases, and merge the shard results into one
+    consistent snapshot.
+    Ties between shards are ordered by shard rather than by arrival.
+    """
+    def __init__(self, time_window=3600, bucket_size=None, shards=16):
+        self.time_window = time_window
+        self.shards = [TopItemsCalculator(time_window, bucket_size) for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+
+    def _shard_index(self, item):
+        return hash(item) % len(self.shards)
+
+    def add_purchase(self, item):
+        index = self._shard_index(item)
+        with self.locks[index]:
+            self.shards[index].add_purchase(item)
+
+    def add_purchases(self, purchases):
+        """
+        Adds a batch of (item, timestamp) purchases, taking each shard lock once.
+        A timestamp of None means "now"; the clock is read once for the batch.
+        """
+        batch_time = None
+        per_shard = defaultdict(list)
+        for item, timestamp in purchases:
+            if timestamp is None:
+                if batch_time is None:
+                    batch_time = time.time()
+                timestamp = batch_time
+            per_shard[self._shard_index(item)].append((item, timestamp))
+        for index, shard_purchases in per_shard.items():
+            with self.locks[index]:
+                self.shards[index].add_purchases(shard_purchases)
+
+    def get_top_items(self, top_n=10, now=None):
+        # Every shard expires against the newest purchase seen in any shard (or
+        # against now if given), so a shard without recent purchases does not
+        # keep counting old ones and the result matches TopItemsCalculator
+        # top_n of None or below zero slices the full ranking, as in TopItemsCalculator
+        everything = top_n is None or top_n < 0
+        results = []
+        for lock in self.locks:
+            lock.acquire()
+        try:
+            if now is None:
+                now = max((shard.latest for shard in self.shards if shard.latest is not None), default=None)
+            for shard in self.shards:
+                if now is not None:
+                    shard.cleanup_old_items(now)
+                results.extend(shard.get_top_items(None if everything else top_n))
+        finally:
+            for lock in self.locks:
+                lock.release()
+        if everything:
+            return sorted(results, key=lambda x: x[1], reverse=True)[:top_n]
+        return heapq.nlargest(top_n, results, key=lambda x: x[1])
+
+
+class SnapshotCheckpointer:
+    """
+    Saves a calculator's snapshot to path every interval seconds from a
+    background thread. Pass the lock that guards the calculator, if any, so
+    a snapshot is never taken while another thread is adding purchases.
+    A failed checkpoint is reported on stderr and kept in last_error; the
+    thread carries on with the next one.
+    stop() ends the thread and, by default, writes one last snapshot.
+    """
+    def __init__(self, calculator, path, interval=60, lock=None):
+        self.calculator = calculator
+        self.path = path
+        self.interval = interval
+        self.lock = lock
+        self.failures = 0
+        self.last_error = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="snapshot-checkpointer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def checkpoint(self):
+        if self.lock is None:
+            self.calculator.save_snapshot(self.path)
+        else:
+            with self.lock:
+                self.calculator.save_snapshot(self.path)
+
+    def stop(self, final_checkpoint=True):
+        self._stopped.set()
+        self._thread.join()
+        if final_checkpoint:
+            self.checkpoint()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.checkpoint()
+            except Exception as error:
+                self.failures += 1
+                self.last_error = error
+                print(f"SnapshotCheckpointer: checkpoint to {self.path} failed: {error!r}", file=sys.stderr)
+
+
+async def consume_purchases(calculator, source, max_batch=1000):
+    """
+    Feeds (item, timestamp) purchases from an asyncio.Queue or an async
+    iterator into calculator.add_purchases in micro-batches.
+    From a queue, each micro-batch is whatever is already waiting (up to
+    max_batch), and consumption stops at a None sentinel. From an async
+    iterator, batches of max_batch are flushed until it is exhausted.
+    Returns the number of purchases consumed.
+    """
+    consumed = 0
+    if isinstance(source, asyncio.Queue):
+        finished = False
+        while not finished:
+            batch = []
+            purchase = await source.get()
+            while True:
+                source.task_done()
+                if purchase is None:
+                    finished = True
+                    break
+                batch.append(purchase)
+                if len(batch) >= max_batch or source.empty():
+                    break
+                purchase = source.get_nowait()
+            if batch:
+                calculator.add_purchases(batch)
+                consumed += len(batch)
+        return consumed
+
+    batch = []
+    async for purchase in source:
+        batch.append(purchase)
+        if len(batch) >= max_batch:
+            calculator.add_purchases(batch)
+            consumed += len(batch)
+            batch = []
+    if batch:
+        calculator.add_purchases(batch)
+        consumed += len(batch)
+    return consumed
 
-    def get_top_items(self, top_n=10):
-        # Sort items by count and return the top N
-        sorted_items = sorted(self.items.items(), key=lambda x: x[1], reverse=True)
-        return sorted_items[:top_n]
 
 # Example usage
 if __name__ == "__main__":
@@ -51,6 +820,53 @@ if __name__ == "__main__":
     # Generate widget
     top_items = calculator.get_top_items()
     print("Top Items:", top_items)
+
+    # Bucketed window: counts are kept per 10-second bucket instead of per purchase
+    bucketed = TopItemsCalculator(bucket_size=10)
+    for item in ("item1", "item2", "item1"):
+        bucketed.add_purchase(item)
+    print("Top Items (bucketed):", bucketed.get_top_items())
+
+    # Approximate calculator: fixed memory, estimated counts with error bounds
+    approximate = ApproximateTopItemsCalculator()
+    for item in ("item1", "item2", "item1"):
+        approximate.add_purchase(item)
+    print("Top Items (approximate):", approximate.get_top_items())
+    print("Error bounds:", approximate.error_bounds())
+
+    # Concurrent calculator: safe to share between threads without a global lock
+    concurrent = ConcurrentTopItemsCalculator()
+    workers = [threading.Thread(target=concurrent.add_purchase, args=(item,)) for item in ("item1", "item2", "item1")]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    print("Top Items (concurrent):", concurrent.get_top_items())
+
+    # Replaying an event log: explicit timestamps, loaded in one batch
+    replay_start = time.time() - 120
+    replayed = TopItemsCalculator()
+    replayed.add_purchases((f"item{i % 3}", replay_start + i) for i in range(100))
+    print("Top Items (replayed):", replayed.get_top_items())
+
+    # Draining purchases from an asyncio.Queue in micro-batches
+    async def drain_queue():
+        queue = asyncio.Queue()
+        for item in ("item1", "item2", "item1"):
+            queue.put_nowait((item, None))
+        queue.put_nowait(None)  # End of stream
+        streamed = TopItemsCalculator()
+        await consume_purchases(streamed, queue)
+        return streamed.get_top_items()
+
+    print("Top Items (asyncio):", asyncio.run(drain_queue()))
+
+    # Surviving a restart: snapshot the window and restore it
+    snapshot_path = "top_items.snapshot"
+    replayed.save_snapshot(snapshot_path)
+    restored = TopItemsCalculator.load_snapshot(snapshot_path)
+    os.remove(snapshot_path)
+    print("Top Items (restored):", restored.get_top_items())
     
     # Simulate time passing
     time.sleep(2)
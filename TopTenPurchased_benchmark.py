@@ -0,0 +1,279 @@
+"""
+Benchmarks for the calculators in TopTenPurchased.py.
+
+Run it directly:
+    python TopTenPurchased_benchmark.py
+
+The approximate benchmark feeds the same skewed (Zipfian) purchase stream to
+the exact TopItemsCalculator and to ApproximateTopItemsCalculator, then
+compares the top items they report, the error of the estimated counts, the
+memory they retain and the time they take. The purchases are timestamped
+across the whole window, so every pane of the approximate calculator is in
+use and the memory reported is its steady state.
+
+The concurrent benchmark measures ingest throughput for a varying number of
+threads, comparing one TopItemsCalculator behind a global lock with
+ConcurrentTopItemsCalculator. On a CPython build with the GIL both stay close
+to single-thread speed, since only one thread runs Python code at a time; the
+shards remove lock contention, which pays off on free-threaded builds. The
+stress test checks that no purchase is lost when many threads add at once.
+
+The batch benchmark replays a timestamped event log through add_purchase one
+event at a time and through add_purchases in batches. The replay check feeds
+a log from long ago to every calculator and checks that they report the same
+top items, since their windows follow the purchase timestamps.
+
+The snapshot benchmark fills an hour-long window with millions of purchases,
+saves it and times load_snapshot, for the exact window and for the bucketed
+window with 1 second buckets, and checks the restored top items.
+"""
+import itertools
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from TopTenPurchased import ApproximateTopItemsCalculator, ConcurrentTopItemsCalculator, TopItemsCalculator
+
+
+def zipf_stream(length, unique_items, exponent=1.1, seed=0):
+    """
+    Returns a list of length purchases drawn from unique_items SKUs,
+    where the SKU of rank r is bought with probability proportional to 1 / r^exponent.
+    """
+    rng = random.Random(seed)
+    cumulative = list(itertools.accumulate(1.0 / rank ** exponent for rank in range(1, unique_items + 1)))
+    return [f"sku{index}" for index in rng.choices(range(unique_items), cum_weights=cumulative, k=length)]
+
+
+def _feed(calculator, stream):
+    start = time.perf_counter()
+    for item in stream:
+        calculator.add_purchase(item)
+    return time.perf_counter() - start
+
+
+def _feed_batches(calculator, events, batch_size=10_000):
+    start = time.perf_counter()
+    for offset in range(0, len(events), batch_size):
+        calculator.add_purchases(events[offset:offset + batch_size])
+    return time.perf_counter() - start
+
+
+def _retained_memory(factory, events):
+    # Bytes still allocated by the calculator after it has seen all events
+    tracemalloc.start()
+    calculator = factory()
+    _feed_batches(calculator, events)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def benchmark_approximate(length=200_000, unique_items=500_000, exponent=1.1, top_n=10, seed=0, time_window=3600):
+    """
+    Compares the exact and approximate calculators on one Zipfian stream
+    spread evenly over a full window.
+    """
+    stream = zipf_stream(length, unique_items, exponent, seed)
+    start_time = 1_000_000_000.0
+    events = [(item, start_time + index * time_window / length) for index, item in enumerate(stream)]
+    factories = {
+        "exact": lambda: TopItemsCalculator(time_window),
+        "approximate": lambda: ApproximateTopItemsCalculator(time_window, width=4096, depth=4, capacity=500),
+        "approx/12": lambda: ApproximateTopItemsCalculator(time_window, width=4096, depth=4, capacity=500,
+                                                           panes=12),
+    }
+
+    results = {}
+    for name, factory in factories.items():
+        calculator = factory()
+        seconds = _feed_batches(calculator, events)
+        if isinstance(calculator, ApproximateTopItemsCalculator):
+            assert len(calculator.panes) == calculator._pane_count, f"{name}: only {len(calculator.panes)} panes live"
+        results[name] = {
+            "calculator": calculator,
+            "seconds": seconds,
+            "memory": _retained_memory(factory, events),
+        }
+
+    exact = results["exact"]["calculator"]
+    approximate = results["approximate"]["calculator"]
+    exact_top = exact.get_top_items(top_n)
+    approximate_top = approximate.get_top_items(top_n)
+    recall = len({item for item, _ in exact_top} & {item for item, _ in approximate_top}) / len(exact_top)
+    relative_errors = [(count - exact.items.get(item, 0)) / max(exact.items.get(item, 0), 1)
+                       for item, count in approximate_top]
+
+    print(f"Stream: {length} purchases over {unique_items} SKUs in {time_window}s, Zipf exponent {exponent}")
+    for name, result in results.items():
+        calculator = result["calculator"]
+        panes = f", {len(calculator.panes)} panes" if name != "exact" else ""
+        print(f"  {name:12s} {result['seconds']:.2f}s  "
+              f"{length / result['seconds']:,.0f} purchases/s  "
+              f"{result['memory'] / 1e6:.1f} MB retained{panes}")
+    print(f"  top-{top_n} recall: {recall:.2f}")
+    print(f"  mean relative overcount of reported counts: {sum(relative_errors) / len(relative_errors):.4f}")
+    print(f"  error bounds: {approximate.error_bounds()}")
+
+
+class GlobalLockCalculator:
+    """
+    The baseline the concurrent calculator replaces: one calculator, one lock.
+    """
+    def __init__(self):
+        self.calculator = TopItemsCalculator()
+        self.lock = threading.Lock()
+
+    def add_purchase(self, item):
+        with self.lock:
+            self.calculator.add_purchase(item)
+
+    def get_top_items(self, top_n=10):
+        with self.lock:
+            return self.calculator.get_top_items(top_n)
+
+
+def _run_threads(calculator, streams):
+    # Add every stream from its own thread and return the elapsed time
+    barrier = threading.Barrier(len(streams) + 1)
+
+    def worker(stream):
+        barrier.wait()
+        for item in stream:
+            calculator.add_purchase(item)
+
+    threads = [threading.Thread(target=worker, args=(stream,)) for stream in streams]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def stress_test_concurrent(threads=8, purchases_per_thread=50_000, unique_items=1_000, seed=0):
+    """
+    Adds purchases from many threads at once, reading the top items while they
+    run, and checks that the final counts match what was added.
+    """
+    streams = [zipf_stream(purchases_per_thread, unique_items, seed=seed + index) for index in range(threads)]
+    calculator = ConcurrentTopItemsCalculator()
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            top = calculator.get_top_items()
+            assert all(top[i][1] >= top[i + 1][1] for i in range(len(top) - 1))
+
+    reader_thread = threading.Thread(target=reader)
+    reader_thread.start()
+    _run_threads(calculator, streams)
+    stop.set()
+    reader_thread.join()
+
+    expected = Counter(itertools.chain.from_iterable(streams))
+    actual = Counter()
+    for shard in calculator.shards:
+        actual.update(shard.items)
+    assert actual == expected, "purchases were lost or double counted"
+    # Ties may come out in a different order, so compare the counts
+    assert [count for _, count in calculator.get_top_items()] == [count for _, count in expected.most_common(10)]
+    print(f"Stress test passed: {threads} threads, {threads * purchases_per_thread} purchases")
+
+
+def benchmark_concurrent(thread_counts=(1, 2, 4, 8), purchases_per_thread=100_000, unique_items=100_000):
+    """
+    Prints ingest throughput for each thread count, global lock versus shards.
+    """
+    for threads in thread_counts:
+        streams = [zipf_stream(purchases_per_thread, unique_items, seed=index) for index in range(threads)]
+        total = threads * purchases_per_thread
+        for name, factory in (("global lock", GlobalLockCalculator), ("sharded", ConcurrentTopItemsCalculator)):
+            seconds = _run_threads(factory(), streams)
+            print(f"  {threads} threads  {name:12s} {total / seconds:,.0f} purchases/s")
+
+
+def benchmark_batch(length=500_000, unique_items=50_000, batch_size=10_000):
+    """
+    Compares per-event add_purchase with batched add_purchases on a replayed log.
+    """
+    stream = zipf_stream(length, unique_items)
+    start_time = time.time() - length / 1000
+    events = [(item, start_time + index / 1000) for index, item in enumerate(stream)]
+
+    calculator = TopItemsCalculator()
+    per_event = _feed(calculator, stream)
+
+    calculator = TopItemsCalculator()
+    start = time.perf_counter()
+    for offset in range(0, length, batch_size):
+        calculator.add_purchases(events[offset:offset + batch_size])
+    batched = time.perf_counter() - start
+
+    print(f"  add_purchase   {length / per_event:,.0f} purchases/s")
+    print(f"  add_purchases  {length / batched:,.0f} purchases/s (batches of {batch_size})")
+
+
+def check_historical_replay(length=100_000, unique_items=1_000, time_window=600, top_n=5):
+    """
+    Replays a log from 2001 and checks the calculators agree on its top items,
+    also when asked for every item (top_n of None) or all but the last few.
+    """
+    start_time = 1_000_000_000.0
+    events = [(item, start_time + index / 100) for index, item in enumerate(zipf_stream(length, unique_items))]
+    calculators = {
+        "exact": TopItemsCalculator(time_window),
+        "concurrent": ConcurrentTopItemsCalculator(time_window),
+        "approximate": ApproximateTopItemsCalculator(time_window, panes=time_window),
+    }
+    for calculator in calculators.values():
+        calculator.add_purchases(events)
+    expected = calculators["exact"].get_top_items(top_n)
+    assert expected, "the replayed window is empty"
+    everything = calculators["exact"].get_top_items(None)
+    for name, calculator in calculators.items():
+        top = calculator.get_top_items(top_n)
+        assert [item for item, _ in top] == [item for item, _ in expected], (name, top, expected)
+        # None and negative top_n slice the full ranking, as for a list
+        assert calculator.get_top_items(None)[:top_n] == top, name
+        assert len(calculator.get_top_items(-2)) == len(calculator.get_top_items(None)) - 2, name
+    assert sorted(calculators["concurrent"].get_top_items(None)) == sorted(everything)
+    print(f"  replayed log: all calculators report {[item for item, _ in expected]}")
+
+
+def benchmark_snapshot(length=3_000_000, unique_items=50_000, time_window=3600, top_n=10):
+    """
+    Prints the snapshot size and save and restore times of a full window.
+    """
+    stream = zipf_stream(length, unique_items)
+    start_time = 1_000_000_000.0
+    events = [(item, start_time + index * time_window / length) for index, item in enumerate(stream)]
+    now = events[-1][1]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "window.snapshot")
+        for name, bucket_size in (("exact", None), ("1s buckets", 1)):
+            calculator = TopItemsCalculator(time_window, bucket_size)
+            calculator.add_purchases(events)
+            start = time.perf_counter()
+            calculator.save_snapshot(path)
+            saved = time.perf_counter() - start
+            start = time.perf_counter()
+            restored = TopItemsCalculator.load_snapshot(path, now=now)
+            loaded = time.perf_counter() - start
+            assert restored.get_top_items(top_n) == calculator.get_top_items(top_n)
+            print(f"  {name:10s} {length:,} purchases, {os.path.getsize(path) / 2 ** 20:5.1f} MB: "
+                  f"saved in {saved:.2f}s, restored in {loaded:.2f}s")
+
+
+if __name__ == "__main__":
+    check_historical_replay()
+    benchmark_snapshot()
+    benchmark_approximate()
+    benchmark_batch()
+    stress_test_concurrent()
+    benchmark_concurrent()